@@ -1,38 +1,9 @@
-from sqlalchemy import create_engine, text
-import os
+from sqlalchemy import inspect, text
+from ETL.LoadData.Dialects import dialect_for
+from ETL.LoadData.Engine import get_engine
 
-def create_tables():
-    engine = None
-    try:
-
-        username = os.getenv('RDS_USERNAME')
-        password = os.getenv('RDS_PASSWORD')
-        host = os.getenv('RDS_HOST')
-        port = os.getenv('RDS_PORT', 5432)
-        database = os.getenv('RDS_DATABASE')
-
-        url = f'postgresql+psycopg2://{username}:{password}@{host}:{port}/{database}'
-
-        engine = create_engine(url)
-        with engine.connect() as connection:
-            connection.execute(text("""
-                CREATE TABLE IF NOT EXISTS USERS (
-                    steamid BIGINT PRIMARY KEY,
-                    num_games_owned INT NOT NULL,
-                    num_reviews INT NOT NULL
-                );
-            """))
-
-            connection.execute(text("""
-                CREATE TABLE IF NOT EXISTS GAMES (
-                    appid INT PRIMARY KEY,
-                    name TEXT NOT NULL
-                );
-            """))
-
-            connection.execute(text("""
-                CREATE TABLE IF NOT EXISTS REVIEWS (
-                    recommendationid BIGINT PRIMARY KEY,
+REVIEW_COLUMNS = """
+                    recommendationid BIGINT NOT NULL,
                     steamid BIGINT NOT NULL,
                     appid INT NOT NULL,
                     language VARCHAR(50),
@@ -51,16 +22,161 @@ def create_tables():
                     playtime_forever INT,
                     playtime_last_two_weeks INT,
                     last_played TIMESTAMP,
+                    content_hash BIGINT"""
+
+# Time the row was last inserted or changed by a load, in UTC. Incremental exports filter on it.
+LOAD_TIME_COLUMN = "loaded_at TIMESTAMP DEFAULT {utc_now}"
+LOAD_TIME_TABLES = ('users', 'games', 'reviews')
+
+REVIEW_FOREIGN_KEYS = """
                     FOREIGN KEY (steamid) REFERENCES users(steamid) ON DELETE CASCADE,
+                    FOREIGN KEY (appid) REFERENCES games(appid) ON DELETE CASCADE"""
+
+def create_tables(partitioned: bool = False, url: str = None):
+    """
+    Create the USERS, GAMES and REVIEWS tables together with the sync state and analytics tables.
+
+    The same DDL is used for PostgreSQL and for a local SQLite database (DATABASE_URL=sqlite:///...).
+
+    Args:
+        partitioned (bool): Declare REVIEWS as range-partitioned by month on timestamp_created.
+            Monthly partitions are created by the loader as data arrives; REVIEWS_DEFAULT catches
+            rows inserted into REVIEWS directly for a month without a partition. PostgreSQL only.
+        url (str, optional): SQLAlchemy URL of the database. Defaults to DATABASE_URL or the RDS_* settings.
+    """
+    try:
+        engine = get_engine(url)
+        dialect = dialect_for(engine)
+        if partitioned and not dialect.supports_partitions:
+            print(f"Partitioned tables are not available on {dialect.name}.")
+            return
+
+        load_time_column = LOAD_TIME_COLUMN.format(utc_now=dialect.utc_now)
+
+        with engine.connect() as connection:
+            connection.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS USERS (
+                    steamid BIGINT PRIMARY KEY,
+                    num_games_owned INT NOT NULL,
+                    num_reviews INT NOT NULL,
+                    {load_time_column}
+                );
+            """))
+
+            connection.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS GAMES (
+                    appid INT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    {load_time_column}
+                );
+            """))
+
+            if partitioned:
+                connection.execute(text(f"""
+                    CREATE TABLE IF NOT EXISTS REVIEWS (
+                        {REVIEW_COLUMNS},
+                        {load_time_column},
+                        PRIMARY KEY (recommendationid, timestamp_created),
+                        {REVIEW_FOREIGN_KEYS}
+                    ) PARTITION BY RANGE (timestamp_created);
+                """))
+                connection.execute(text("CREATE TABLE IF NOT EXISTS REVIEWS_DEFAULT PARTITION OF REVIEWS DEFAULT;"))
+            else:
+                connection.execute(text(f"""
+                    CREATE TABLE IF NOT EXISTS REVIEWS (
+                        {REVIEW_COLUMNS},
+                        {load_time_column},
+                        PRIMARY KEY (recommendationid),
+                        {REVIEW_FOREIGN_KEYS}
+                    );
+                """))
+
+            if 'content_hash' not in {column['name'] for column in inspect(connection).get_columns('reviews')}:
+                connection.execute(text("ALTER TABLE REVIEWS ADD COLUMN content_hash BIGINT;"))
+            for table_name in LOAD_TIME_TABLES:
+                if 'loaded_at' not in {column['name'] for column in inspect(connection).get_columns(table_name)}:
+                    dialect.add_load_time_column(connection, table_name)
+
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS SYNC_STATE (
+                    appid INT PRIMARY KEY,
+                    last_timestamp_updated BIGINT,
+                    last_cursor TEXT,
+                    last_synced_at TIMESTAMP,
+                    FOREIGN KEY (appid) REFERENCES games(appid) ON DELETE CASCADE
+                );
+            """))
+
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS REVIEW_JOBS (
+                    appid INT PRIMARY KEY,
+                    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                    attempts INT NOT NULL DEFAULT 0,
+                    claimed_by TEXT,
+                    claimed_at TIMESTAMP,
+                    finished_at TIMESTAMP,
+                    rows_loaded BIGINT,
+                    last_error TEXT,
+                    enqueued_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (appid) REFERENCES games(appid) ON DELETE CASCADE
+                );
+            """))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_review_jobs_pending ON review_jobs (enqueued_at, appid) "
+                "WHERE status = 'pending';"
+            ))
+
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS REFRESH_SCHEDULE (
+                    appid INT PRIMARY KEY,
+                    velocity DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    refresh_interval DOUBLE PRECISION NOT NULL,
+                    next_refresh_at TIMESTAMP NOT NULL,
+                    last_refreshed_at TIMESTAMP,
+                    last_yield INT,
+                    yield_per_day DOUBLE PRECISION,
                     FOREIGN KEY (appid) REFERENCES games(appid) ON DELETE CASCADE
                 );
             """))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_refresh_schedule_next ON refresh_schedule (next_refresh_at);"
+            ))
+
+            connection.execute(text("CREATE INDEX IF NOT EXISTS idx_reviews_appid ON reviews (appid);"))
+            connection.execute(text("CREATE INDEX IF NOT EXISTS idx_reviews_steamid ON reviews (steamid);"))
+            connection.execute(text("CREATE INDEX IF NOT EXISTS idx_reviews_loaded_at ON reviews (loaded_at);"))
+            connection.execute(text("CREATE INDEX IF NOT EXISTS idx_users_loaded_at ON users (loaded_at);"))
+            connection.execute(text("CREATE INDEX IF NOT EXISTS idx_games_loaded_at ON games (loaded_at);"))
+
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS GAME_REVIEW_STATS (
+                    appid INT PRIMARY KEY,
+                    review_count BIGINT NOT NULL,
+                    total_playtime BIGINT,
+                    avg_playtime NUMERIC,
+                    total_votes_up BIGINT,
+                    total_votes_funny BIGINT,
+                    refreshed_at TIMESTAMP,
+                    FOREIGN KEY (appid) REFERENCES games(appid) ON DELETE CASCADE
+                );
+            """))
+
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS USER_REVIEW_STATS (
+                    steamid BIGINT PRIMARY KEY,
+                    review_count BIGINT NOT NULL,
+                    total_playtime BIGINT,
+                    refreshed_at TIMESTAMP,
+                    FOREIGN KEY (steamid) REFERENCES users(steamid) ON DELETE CASCADE
+                );
+            """))
+
+            dialect.create_data_version(connection)
 
             connection.commit()
         print("Schema successfully created")
     except Exception as e:
         print(f"Error creating tables: {e}")
-        engine = None
 
 if __name__ == '__main__':
     create_tables()
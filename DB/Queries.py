@@ -1,109 +1,91 @@
-from sqlalchemy import create_engine, text
-import os
+from DB.QueryRunner import DEFAULT_CACHE_DIR, DEFAULT_ROW_LIMIT, NamedQuery, QueryRunner, print_results
 
-def run_queries():
-    username = os.getenv('RDS_USERNAME')
-    password = os.getenv('RDS_PASSWORD')
-    host = os.getenv('RDS_HOST')
-    port = os.getenv('RDS_PORT', 5432)
-    database = os.getenv('RDS_DATABASE')
-
-    url = f'postgresql+psycopg2://{username}:{password}@{host}:{port}/{database}'
-    engine = create_engine(url)
-
-    with engine.connect() as connection:
-
-        print("\n--- USERS ---")
-        result = connection.execute(text("SELECT * FROM users"))
-        for row in result:
-            print(row)
-
-        print("\n--- REVIEWS WITH GAME NAMES ---")
-        result = connection.execute(text("""
-            SELECT r.recommendationid, u.steamid, g.name, r.voted_up, r.weighted_vote_score
-            FROM reviews r
-            JOIN users u ON r.steamid = u.steamid
-            JOIN games g ON r.appid = g.appid
-        """))
-        for row in result:
-            print(row)
-
-        print("\n--- TOP 5 GAMES BY REVIEW COUNT ---")
-        result = connection.execute(text("""
-            SELECT g.name, COUNT(*) AS review_count
-            FROM reviews r
-            JOIN games g ON r.appid = g.appid
-            GROUP BY g.name
-            ORDER BY review_count DESC
-            LIMIT 5
-        """))
-        for row in result:
-            print(row)
-
-        print("\n--- AVERAGE PLAYTIME PER GAME ---")
-        result = connection.execute(text("""
-            SELECT g.name, AVG(r.playtime_forever) AS avg_playtime
-            FROM reviews r
-            JOIN games g ON r.appid = g.appid
-            GROUP BY g.name
-        """))
-        for row in result:
-            print(row)
+QUERIES = {query.name: query for query in (
+    NamedQuery("users", "SELECT * FROM users ORDER BY steamid", description="Users"),
+    NamedQuery("reviews_with_game_names", """
+        SELECT r.recommendationid, u.steamid, g.name, r.voted_up, r.weighted_vote_score
+        FROM reviews r
+        JOIN users u ON r.steamid = u.steamid
+        JOIN games g ON r.appid = g.appid
+    """, description="Reviews with game names"),
+    NamedQuery("top_games_by_review_count", """
+        SELECT g.name, s.review_count
+        FROM game_review_stats s
+        JOIN games g ON s.appid = g.appid
+        ORDER BY s.review_count DESC
+        LIMIT :limit
+    """, {"limit": 5}, "Top games by review count"),
+    NamedQuery("average_playtime_per_game", """
+        SELECT g.name, s.avg_playtime
+        FROM game_review_stats s
+        JOIN games g ON s.appid = g.appid
+    """, description="Average playtime per game"),
+    NamedQuery("users_with_many_reviews", """
+        SELECT steamid, review_count
+        FROM user_review_stats
+        WHERE review_count > :min_reviews
+    """, {"min_reviews": 10}, "Users with many reviews"),
+    NamedQuery("top_games_by_upvotes", """
+        SELECT g.name, s.total_votes_up AS total_upvotes
+        FROM game_review_stats s
+        JOIN games g ON s.appid = g.appid
+        ORDER BY s.total_votes_up DESC NULLS LAST
+        LIMIT :limit
+    """, {"limit": 5}, "Top games by total upvotes"),
+    NamedQuery("top_users_by_playtime", """
+        SELECT steamid, total_playtime
+        FROM user_review_stats
+        ORDER BY total_playtime DESC NULLS LAST
+        LIMIT :limit
+    """, {"limit": 5}, "Top users by total playtime"),
+    NamedQuery("games_with_mixed_reviews", """
+        SELECT name, upvotes, total_votes, upvote_ratio
+        FROM (
+            SELECT g.name,
+                   s.total_votes_up AS upvotes,
+                   s.total_votes_up + s.total_votes_funny AS total_votes,
+                   ROUND(CAST(s.total_votes_up / NULLIF(CAST(s.total_votes_up + s.total_votes_funny AS FLOAT), 0) * 100
+                              AS NUMERIC), 2) AS upvote_ratio
+            FROM game_review_stats s
+            JOIN games g ON s.appid = g.appid
+        ) ratios
+        WHERE upvote_ratio BETWEEN :min_ratio AND :max_ratio
+        ORDER BY upvote_ratio
+    """, {"min_ratio": 40, "max_ratio": 60}, "Games with mixed reviews"),
+)}
 
-        print("\n--- USERS WITH >10 REVIEWS ---")
-        result = connection.execute(text("""
-            SELECT u.steamid, COUNT(r.recommendationid) AS review_count
-            FROM users u
-            JOIN reviews r ON u.steamid = r.steamid
-            GROUP BY u.steamid
-            HAVING COUNT(r.recommendationid) > 10
-        """))
-        for row in result:
-            print(row)
+def run_queries(names: list = None, params: dict = None, workers: int = 4, row_limit: int = DEFAULT_ROW_LIMIT,
+                output_dir: str = None, explain: bool = False, cache_dir: str = DEFAULT_CACHE_DIR,
+                cache_ttl: float = 300) -> list:
+    """
+    Run predefined queries concurrently and print their results and timings.
 
-        connection.execute(text("DELETE FROM reviews WHERE appid = :appid"), {"appid": 100})
-        connection.commit()
-        print("\nDeleted reviews for appid=100")
+    Args:
+        names (list, optional): Names from QUERIES to run. Defaults to all of them.
+        params (dict, optional): Bind parameter overrides, e.g. {'limit': 10}.
+        workers (int): Number of queries run at the same time.
+        row_limit (int): Maximum number of rows per query (None for no limit).
+        output_dir (str, optional): Stream every result to a CSV file in this directory instead of printing it.
+        explain (bool): Print EXPLAIN ANALYZE plans instead of results.
+        cache_dir (str, optional): Directory of the result cache (None disables caching).
+        cache_ttl (float): Maximum age of a cached result in seconds.
 
-        print("\n--- TOP GAMES BY TOTAL UPVOTES ---")
-        result = connection.execute(text("""
-            SELECT g.name, SUM(r.votes_up) AS total_upvotes
-            FROM reviews r
-            JOIN games g ON r.appid = g.appid
-            GROUP BY g.name
-            ORDER BY total_upvotes DESC
-            LIMIT 5
-        """))
-        for row in result:
-            print(row)
+    Returns:
+        list: QueryResult instances.
 
-        print("\n--- TOP 5 USERS BY TOTAL PLAYTIME ---")
-        result = connection.execute(text("""
-            SELECT u.steamid, SUM(r.playtime_forever) AS total_playtime
-            FROM users u
-            JOIN reviews r ON u.steamid = r.steamid
-            GROUP BY u.steamid
-            ORDER BY total_playtime DESC
-            LIMIT 5
-        """))
-        for row in result:
-            print(row)
+    Raises:
+        ValueError: If an unknown query name is given.
+    """
+    unknown = [name for name in names or [] if name not in QUERIES]
+    if unknown:
+        raise ValueError(f"Unknown queries {unknown}. Expected any of {list(QUERIES)}.")
 
-        print("\n--- GAMES WITH MIXED REVIEWS ---")
-        result = connection.execute(text("""
-            SELECT g.name,
-                   SUM(r.votes_up) AS upvotes,
-                   SUM(r.votes_funny + r.votes_up) AS total_votes,
-                   ROUND(SUM(r.votes_up) / NULLIF(SUM(r.votes_funny + r.votes_up)::FLOAT, 0) * 100, 2) AS upvote_ratio
-            FROM reviews r
-            JOIN games g ON r.appid = g.appid
-            GROUP BY g.name
-            HAVING ROUND(SUM(r.votes_up) / NULLIF(SUM(r.votes_funny + r.votes_up)::FLOAT, 0) * 100, 2)
-                    BETWEEN 40 AND 60
-            ORDER BY upvote_ratio
-        """))
-        for row in result:
-            print(row)
+    queries = [QUERIES[name] for name in names] if names else list(QUERIES.values())
+    runner = QueryRunner(workers=workers, row_limit=row_limit, cache_dir=cache_dir, cache_ttl=cache_ttl,
+                         output_dir=output_dir)
+    results = runner.run_many(queries, params, explain)
+    print_results(results)
+    return results
 
 if __name__ == '__main__':
     try:
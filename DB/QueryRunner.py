@@ -0,0 +1,258 @@
+import csv
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+from ETL.LoadData.Dialects import dialect_for
+from ETL.LoadData.Engine import get_engine, streaming
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".steam_etl", "query_cache")
+DEFAULT_ROW_LIMIT = 100
+FETCH_SIZE = 1000
+
+class NamedQuery:
+    """
+    A read-only SQL query registered under a name, with default values for its bind parameters.
+    """
+
+    def __init__(self, name: str, sql: str, params: dict = None, description: str = ""):
+        """
+        Args:
+            name (str): Name used to select the query on the command line.
+            sql (str): The SELECT statement, with :name bind parameters.
+            params (dict, optional): Default values of the bind parameters.
+            description (str): Heading printed above the results.
+        """
+        self.name = name
+        self.sql = sql
+        self.params = params or {}
+        self.description = description or name
+
+    def bind(self, overrides: dict = None) -> dict:
+        """
+        Merge parameter overrides into the defaults. Overrides for parameters the query does not use are ignored.
+
+        Args:
+            overrides (dict, optional): Parameter values given by the caller.
+
+        Returns:
+            dict: The bind parameters for this query.
+        """
+        params = dict(self.params)
+        for key, value in (overrides or {}).items():
+            if key in params:
+                params[key] = type(params[key])(value) if params[key] is not None else value
+        return params
+
+class QueryResult:
+    """
+    Outcome of running one NamedQuery.
+    """
+
+    def __init__(self, query: NamedQuery, params: dict):
+        self.query = query
+        self.params = params
+        self.columns = []
+        self.rows = []
+        self.row_count = 0
+        self.truncated = False
+        self.seconds = 0.0
+        self.cached = False
+        self.output_path = None
+        self.plan = None
+        self.error = None
+
+class QueryRunner:
+    """
+    Runs named queries concurrently over the shared connection pool.
+
+    Results are capped at `row_limit` rows and either kept for printing or, when an output directory
+    is given, streamed to one CSV file per query. Printed results are cached on disk for `cache_ttl` seconds; a cached
+    result is only reused while the database's DATA_VERSION sequence is unchanged, which the ETL
+    advances after every load, so new data is never hidden behind the cache.
+    """
+
+    def __init__(self, engine=None, workers: int = 4, row_limit: int = DEFAULT_ROW_LIMIT, cache_dir: str = None,
+                 cache_ttl: float = 300, output_dir: str = None):
+        """
+        Initialize the runner.
+
+        Args:
+            engine (sqlalchemy.engine.Engine, optional): Engine to run on. Defaults to the shared engine.
+            workers (int): Number of queries run at the same time.
+            row_limit (int): Maximum number of rows kept per query (None for no limit).
+            cache_dir (str, optional): Directory for cached results. Caching is disabled if not set.
+            cache_ttl (float): Maximum age of a cached result in seconds.
+            output_dir (str, optional): Write every result to <output_dir>/<query name>.csv instead of keeping it.
+        """
+        self.engine = engine or get_engine()
+        self.dialect = dialect_for(self.engine)
+        self.workers = workers
+        self.row_limit = row_limit
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.output_dir = output_dir
+        self.data_version = None
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def read_data_version(self):
+        """
+        Read the counter the ETL advances after every load.
+
+        Returns:
+            int: The current data version, or None if the schema has no DATA_VERSION counter.
+        """
+        with self.engine.connect() as conn:
+            return self.dialect.read_data_version(conn)
+
+    def run_many(self, queries: list, params: dict = None, explain: bool = False) -> list:
+        """
+        Run several queries concurrently.
+
+        Args:
+            queries (list): NamedQuery instances.
+            params (dict, optional): Parameter overrides applied to every query that uses them.
+            explain (bool): Run EXPLAIN ANALYZE (EXPLAIN QUERY PLAN on SQLite) instead and keep the plan.
+
+        Returns:
+            list: QueryResult instances in the order of `queries`.
+        """
+        if self.cache_dir and not explain:
+            self.data_version = self.read_data_version()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(lambda query: self.run(query, params, explain), queries))
+
+    def run(self, query: NamedQuery, params: dict = None, explain: bool = False) -> QueryResult:
+        """
+        Run one query. Errors are recorded on the result instead of being raised.
+
+        Args:
+            query (NamedQuery): The query.
+            params (dict, optional): Parameter overrides.
+            explain (bool): Run EXPLAIN ANALYZE instead and keep the plan.
+
+        Returns:
+            QueryResult: The result.
+        """
+        result = QueryResult(query, query.bind(params))
+        start = time.perf_counter()
+        try:
+            if explain:
+                self._explain(result)
+            elif not self._read_cache(result):
+                self._execute(result)
+                self._write_cache(result)
+        except Exception as e:
+            result.error = str(e)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _execute(self, result: QueryResult):
+        with self.engine.connect() as conn:
+            rows = streaming(conn, FETCH_SIZE).execute(text(result.query.sql), result.params)
+            result.columns = list(rows.keys())
+
+            if self.output_dir:
+                result.output_path = os.path.join(self.output_dir, f"{result.query.name}.csv")
+                with open(result.output_path, "w", newline="") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(result.columns)
+                    for row in rows:
+                        if self.row_limit is not None and result.row_count >= self.row_limit:
+                            result.truncated = True
+                            break
+                        writer.writerow(row)
+                        result.row_count += 1
+                return
+
+            for row in rows:
+                if self.row_limit is not None and result.row_count >= self.row_limit:
+                    result.truncated = True
+                    break
+                result.rows.append(tuple(row))
+                result.row_count += 1
+
+    def _explain(self, result: QueryResult):
+        with self.engine.connect() as conn:
+            plan = conn.execute(text(f"{self.dialect.explain_prefix} {result.query.sql}"), result.params)
+            result.plan = [str(row[-1]) for row in plan]
+            conn.rollback()
+
+    def _cache_path(self, result: QueryResult) -> str:
+        key = json.dumps([result.query.sql, result.params, self.row_limit], sort_keys=True, default=str)
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".pickle")
+
+    def _read_cache(self, result: QueryResult) -> bool:
+        if not self.cache_dir or self.output_dir or self.data_version is None:
+            return False
+
+        path = self._cache_path(result)
+        try:
+            if time.time() - os.path.getmtime(path) > self.cache_ttl:
+                return False
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return False
+        if cached.get("data_version") != self.data_version:
+            return False
+
+        result.columns = cached["columns"]
+        result.rows = [tuple(row) for row in cached["rows"]]
+        result.row_count = len(result.rows)
+        result.truncated = cached["truncated"]
+        result.cached = True
+        return True
+
+    def _write_cache(self, result: QueryResult):
+        if not self.cache_dir or self.output_dir or self.data_version is None:
+            return
+
+        path = self._cache_path(result)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # Pickled rather than JSON-encoded so Decimal, datetime and other column types survive a cache hit.
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                "data_version": self.data_version,
+                "columns": result.columns,
+                "rows": result.rows,
+                "truncated": result.truncated,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+def print_results(results: list, stream=sys.stdout):
+    """
+    Print query results followed by a per-query timing summary.
+
+    Args:
+        results (list): QueryResult instances.
+        stream: Where to print (default: stdout).
+    """
+    for result in results:
+        print(f"\n--- {result.query.description.upper()} ---", file=stream)
+        if result.error:
+            print(f"Error: {result.error}", file=stream)
+        elif result.plan is not None:
+            print("\n".join(result.plan), file=stream)
+        elif result.output_path:
+            print(f"Wrote {result.row_count} rows to {result.output_path}", file=stream)
+        else:
+            for row in result.rows:
+                print(row, file=stream)
+        if result.truncated:
+            print(f"(stopped after {result.row_count} rows; raise --row-limit to see more)", file=stream)
+
+    print(f"\n{'query':<32}{'rows':>10}{'seconds':>10}  source", file=stream)
+    for result in results:
+        source = "error" if result.error else "cache" if result.cached else "explain" if result.plan else "database"
+        print(f"{result.query.name:<32}{result.row_count:>10}{result.seconds:>10.3f}  {source}", file=stream)
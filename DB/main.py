@@ -1,28 +1,105 @@
 import argparse
-from dotenv import load_dotenv
-from db.databaseschema import create_tables
-from db.queries import run_queries
 
-def main():
-    load_dotenv()
+def parse_param(value: str) -> tuple:
+    """
+    Parse a KEY=VALUE query parameter for argparse.
+    """
+    key, separator, param = value.partition("=")
+    if not key or not separator:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got '{value}'.")
+    return key, param
 
+def main():
     parser = argparse.ArgumentParser(description="Manage Steam ETL database")
     parser.add_argument(
         "--create-db",
         action="store_true",
         help="Create the database schema (tables)."
     )
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="With --create-db, range-partition the REVIEWS table by month."
+    )
     parser.add_argument(
         "--run-queries",
+        nargs="*",
+        metavar="NAME",
+        default=None,
+        help="Run the predefined SQL queries, or only the named ones."
+    )
+    parser.add_argument(
+        "--list-queries",
+        action="store_true",
+        help="List the predefined queries and their parameters."
+    )
+    parser.add_argument(
+        "--param",
+        type=parse_param,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Override a query parameter, e.g. --param limit=20. May be repeated."
+    )
+    parser.add_argument(
+        "--row-limit",
+        type=int,
+        default=100,
+        help="Maximum number of rows per query (0 for no limit)."
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="Stream every query result to a CSV file in this directory instead of printing it."
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print EXPLAIN ANALYZE plans instead of results."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of queries run at the same time."
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=300,
+        help="Seconds a cached query result may be reused while no new data has been loaded."
+    )
+    parser.add_argument(
+        "--no-cache",
         action="store_true",
-        help="Run the predefined SQL queries."
+        help="Always run the queries against the database."
     )
     args = parser.parse_args()
 
+    # SQLAlchemy is only imported once a command needs the database.
     if args.create_db:
-        create_tables()
-    elif args.run_queries:
-        run_queries()
+        from DB.DatabaseSchema import create_tables
+        create_tables(partitioned=args.partitioned)
+    elif args.list_queries:
+        from DB.Queries import QUERIES
+        for query in QUERIES.values():
+            params = ", ".join(f"{key}={value}" for key, value in query.params.items())
+            print(f"{query.name:<32}{params}")
+    elif args.run_queries is not None:
+        from DB.Queries import run_queries
+        from DB.QueryRunner import DEFAULT_CACHE_DIR
+        params = dict(args.param)
+        run_queries(
+            args.run_queries,
+            params,
+            workers=args.workers,
+            row_limit=args.row_limit or None,
+            output_dir=args.output_dir,
+            explain=args.explain,
+            cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR,
+            cache_ttl=args.cache_ttl
+        )
         
 if __name__ == "__main__":
     main()
@@ -0,0 +1,101 @@
+import argparse
+import random
+import re
+import time
+import pandas as pd
+from ExtractData.ExtractSteamData import clean_data
+
+LANGUAGES = ["english", "schinese", "russian", "spanish", "brazilian", "german"]
+
+def legacy_clean_data(data: list, row_na_threshold: float = 0.5, col_na_threshold: float = 0.8) -> pd.DataFrame:
+    """
+    The original per-cell implementation of clean_data, kept here as the benchmark baseline.
+    """
+    df = pd.DataFrame(data)
+
+    df = df.map(lambda x: re.sub(r"[^A-Za-z0-9\s\-\.,!?]", "", str(x)) if pd.notna(x) else x)
+    df = df.map(lambda x: re.sub(r'\s+', ' ', x.strip()) if isinstance(x, str) else x)
+    df = df.map(lambda x: x.lower() if isinstance(x, str) else x)
+    df.replace("", pd.NA, inplace=True)
+    df.dropna(axis=0, thresh=int(row_na_threshold * df.shape[1]), inplace=True)
+    df.dropna(axis=1, thresh=int((1 - col_na_threshold) * df.shape[0]), inplace=True)
+    df.fillna(0, inplace=True)
+    df.drop_duplicates(inplace=True)
+
+    return df
+
+def make_app_list(size: int) -> list:
+    """
+    Build a synthetic GetAppList payload of the given size.
+    """
+    words = ["Space", "Quest", "Dark", "Soul", "Farm", "Simulator", "™", "®", "  Deluxe ", "Edition:", "2"]
+    return [
+        {"appid": 10 + i, "name": " ".join(random.choices(words, k=random.randint(1, 5)))}
+        for i in range(size)
+    ]
+
+def make_reviews(size: int) -> list:
+    """
+    Build synthetic flattened review dicts shaped like Pagination.fetch_reviews output.
+    """
+    now = int(time.time())
+    reviews = []
+    for i in range(size):
+        created = now - random.randint(0, 365 * 86400)
+        reviews.append({
+            "recommendationid": str(100000000 + i),
+            "language": random.choice(LANGUAGES),
+            "timestamp_created": created,
+            "timestamp_updated": created + random.randint(0, 86400),
+            "voted_up": random.random() < 0.8,
+            "votes_up": random.randint(0, 500),
+            "votes_funny": random.randint(0, 50),
+            "weighted_vote_score": f"{random.random():.6f}",
+            "comment_count": random.randint(0, 20),
+            "steam_purchase": random.random() < 0.9,
+            "received_for_free": random.random() < 0.05,
+            "written_during_early_access": random.random() < 0.1,
+            "primarily_steam_deck": random.random() < 0.1,
+            "steamid": str(76561197960265728 + random.randint(0, 10 ** 9)),
+            "num_games_owned": random.randint(0, 2000),
+            "num_reviews": random.randint(1, 300),
+            "playtime_forever": random.randint(0, 100000),
+            "playtime_last_two_weeks": random.randint(0, 2000),
+            "playtime_at_review": random.randint(0, 100000),
+            "last_played": created + random.randint(0, 86400 * 30),
+        })
+    return reviews
+
+def time_call(func, data, repeat: int) -> float:
+    """
+    Return the best wall time in seconds over `repeat` runs.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark clean_data against the legacy per-cell implementation.")
+    parser.add_argument('--apps', type=int, default=200000, help='Number of synthetic GetAppList rows.')
+    parser.add_argument('--reviews', type=int, default=100000, help='Number of synthetic review rows.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data.')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    datasets = {
+        "GetAppList": make_app_list(args.apps),
+        "Reviews": make_reviews(args.reviews),
+    }
+
+    for name, data in datasets.items():
+        legacy = time_call(legacy_clean_data, data, args.repeat)
+        vectorized = time_call(clean_data, data, args.repeat)
+        print(f"{name} ({len(data)} rows): legacy {legacy:.2f}s, vectorized {vectorized:.2f}s, "
+              f"speedup {legacy / vectorized:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import random
+import time
+import pandas as pd
+from sqlalchemy import text
+from LoadData.LoadSteamData import Database
+import TransformData.TransformSteamData as TransformData
+from Benchmarks.BenchmarkCleanData import make_reviews
+
+def make_review_frame(size: int) -> pd.DataFrame:
+    """
+    Build a load-ready REVIEWS frame from synthetic reviews.
+    """
+    _, reviews_df = TransformData.transform_review_data(440, pd.DataFrame(make_reviews(size)))
+    return reviews_df
+
+def benchmark_method(load_method: str, df: pd.DataFrame, table_name: str, chunk_size: int) -> float:
+    """
+    Load `df` into an empty `table_name` with the given method and return rows per second.
+    """
+    db = Database(load_method, chunk_size)
+    if not db.connect():
+        raise SystemExit(1)
+
+    with db.engine.connect() as conn:
+        conn.execute(text(f'DROP TABLE IF EXISTS "{table_name}"'))
+        df.head(0).to_sql(name=table_name, con=conn, index=False)
+        conn.commit()
+
+    start = time.perf_counter()
+    db.replace_table(df, table_name)
+    elapsed = time.perf_counter() - start
+
+    with db.engine.connect() as conn:
+        conn.execute(text(f'DROP TABLE IF EXISTS "{table_name}"'))
+        conn.commit()
+    return len(df) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark to_sql against COPY loading on a local Postgres (RDS_* variables).")
+    parser.add_argument('--rows', type=int, default=100000, help='Number of synthetic review rows.')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Rows per batch for both methods.')
+    parser.add_argument('--table', type=str, default='bench_reviews', help='Scratch table created and dropped by the benchmark.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data.')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    df = make_review_frame(args.rows)
+
+    results = {method: benchmark_method(method, df, args.table, args.chunk_size) for method in ('to_sql', 'copy')}
+    for method, rows_per_second in results.items():
+        print(f"{method}: {rows_per_second:,.0f} rows/s")
+    print(f"copy speedup: {results['copy'] / results['to_sql']:.1f}x")
+
+if __name__ == "__main__":
+    main()
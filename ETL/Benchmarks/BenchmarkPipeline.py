@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from sqlalchemy import text
+import ExtractData.ExtractSteamData as ExtractSteamData
+import ExtractData.HttpClient as HttpClient
+import ExtractData.Pagination as Pagination
+from ExtractData.RateLimiter import TokenBucket
+from LoadData.LoadSteamData import Database
+from Monitoring.RunMetrics import metrics
+from Benchmarks.FakeSteamApi import FakeSteamApi
+import main as pipeline
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from DB.DatabaseSchema import create_tables
+
+def measure(results: dict, name: str, func):
+    """
+    Run one pipeline stage, recording its wall time and peak traced memory.
+
+    Args:
+        results (dict): Receives the stage's measurements under `name`.
+        name (str): The stage name.
+        func (callable): Runs the stage and returns (result, row_count).
+
+    Returns:
+        The stage's result.
+    """
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result, rows = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+
+    results[name] = {
+        "rows": rows,
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "peak_memory_mb": round(peak / 2 ** 20, 2),
+    }
+    return result
+
+def count_rows(db: Database, table_name: str) -> int:
+    with db.engine.connect() as conn:
+        return conn.execute(text(f'SELECT COUNT(*) FROM "{table_name}"')).scalar()
+
+def load_games(db: Database):
+    """
+    Stream the app list into GAMES with Database.refresh_games, as `main.py --update-games` does.
+    """
+    pipeline.cron_job_fetch_games(db)
+    return None, count_rows(db, "games")
+
+def load_reviews(db: Database, appids: list, workers: int, chunk_size: int, review_count: int):
+    """
+    Fetch, transform and load the reviews of several games concurrently with fetch_reviews_for_games,
+    as `main.py --fetch-reviews` does: chunks are streamed through load_review_chunk, which skips
+    unchanged reviews, writes only changed users and refreshes the review summaries.
+    """
+    failures = pipeline.fetch_reviews_for_games(db, appids, None, workers, chunk_size)
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {len(appids)} games failed to load: {failures}")
+    return None, len(appids) * review_count
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the ETL end to end against a local fake Steam API and a scratch database."
+    )
+    parser.add_argument('--games', type=int, default=3, help='Number of games whose reviews are fetched.')
+    parser.add_argument('--reviews', type=int, default=5000, help='Number of reviews per game.')
+    parser.add_argument('--apps', type=int, default=10000, help='Number of apps in the fake GetAppList.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds of latency added to every response.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of review requests answered with 429.')
+    parser.add_argument('--retry-after', type=float, default=0.0, help='Retry-After sent with injected 429s.')
+    parser.add_argument('--requests-per-second', type=float, default=None, help='Client-side rate limit (default: none).')
+    parser.add_argument('--page-size', type=int, default=Pagination.PAGE_SIZE,
+                        help='Reviews requested per page (1-100).')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Reviews per extract/transform/load chunk.')
+    parser.add_argument('--workers', type=int, default=4, help='Number of games fetched and loaded at the same time.')
+    parser.add_argument('--load-method', choices=['to_sql', 'copy'], default='to_sql', help='Database load method.')
+    parser.add_argument('--output', type=str, default=None, help='Also write the results as JSON to this file.')
+    parser.add_argument(
+        '--database-url',
+        type=str,
+        default=None,
+        help='SQLAlchemy URL of an empty scratch database to load into (default: a temporary SQLite file). '
+             'DATABASE_URL and RDS_* are never used.'
+    )
+    args = parser.parse_args()
+    if not 1 <= args.page_size <= 100:
+        parser.error("--page-size must be between 1 and 100.")
+
+    scratch_dir = None
+    if args.database_url is None:
+        scratch_dir = tempfile.TemporaryDirectory(prefix="steam_etl_benchmark_")
+        args.database_url = f"sqlite:///{os.path.join(scratch_dir.name, 'benchmark.db')}"
+
+    api = FakeSteamApi(args.reviews, max(args.apps, args.games), args.latency, args.error_rate, args.retry_after).start()
+    Pagination.BASE_URL = f"{api.base_url}/appreviews/"
+    Pagination.PAGE_SIZE = args.page_size
+    ExtractSteamData.APP_LIST_URL = f"{api.base_url}/ISteamApps/GetAppList/v2/"
+    rate_limiter = TokenBucket(args.requests_per_second) if args.requests_per_second else None
+    HttpClient.configure(initial_backoff=0.05, max_backoff=1.0, max_attempts=20, rate_limiter=rate_limiter)
+
+    create_tables(url=args.database_url)
+    db = Database(args.load_method, url=args.database_url)
+    if not db.connect():
+        api.stop()
+        raise SystemExit(1)
+    if db.get_game_ids():
+        api.stop()
+        raise SystemExit(f"The scratch database {args.database_url} already holds games. Use an empty database.")
+
+    results = {}
+    metrics.reset()
+    tracemalloc.start()
+    try:
+        measure(results, "games", lambda: load_games(db))
+
+        appids = db.get_game_ids()[:args.games]
+        measure(results, "reviews", lambda: load_reviews(db, appids, args.workers, args.chunk_size, args.reviews))
+        # A second pass over the same games finds every review unchanged, which times the re-sync path.
+        measure(results, "reviews.resync",
+                lambda: load_reviews(db, appids, args.workers, args.chunk_size, args.reviews))
+    finally:
+        tracemalloc.stop()
+        api.stop()
+        db.engine.dispose()
+        if scratch_dir is not None:
+            scratch_dir.cleanup()
+
+    pipeline_stages = metrics.report()["stages"]
+    summary = {
+        "config": vars(args),
+        "requests": api.requests,
+        "rate_limited": api.rate_limited,
+        "stages": results,
+        "pipeline_stages": pipeline_stages,
+    }
+
+    print(f"{'stage':<20}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'peak MB':>10}")
+    for name, stage in results.items():
+        print(f"{name:<20}{stage['rows']:>10}{stage['seconds']:>10.2f}{stage['rows_per_second'] or 0:>12,.0f}"
+              f"{stage['peak_memory_mb']:>10.1f}")
+    print(f"{api.requests} requests served, {api.rate_limited} answered with 429.")
+
+    # Wall times of the pipeline's own stages are summed over worker threads, so they can exceed the stage totals.
+    print(f"\n{'pipeline stage':<20}{'calls':>10}{'seconds':>10}{'rows out':>12}")
+    for name, stage in sorted(pipeline_stages.items()):
+        print(f"{name:<20}{stage['calls']:>10}{stage['wall_time']:>10.2f}{stage['rows_out']:>12}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import TransformData.TransformSteamData as TransformData
+from Benchmarks.FakeSteamApi import BASE_STEAMID, LANGUAGES, NOW
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+def legacy_transform_review_data(gameid, reviews_df: pd.DataFrame):
+    """
+    The original column-by-column implementation of transform_review_data, kept here as the benchmark baseline.
+    """
+    reviews_df['appid'] = int(gameid)
+    reviews_df['weighted_vote_score'] = pd.to_numeric(reviews_df['weighted_vote_score']).round(2)
+
+    for col in ['timestamp_created', 'timestamp_updated', 'last_played']:
+        reviews_df[col] = pd.to_datetime(pd.to_numeric(reviews_df[col], errors='coerce'), unit='s', errors='coerce')
+
+    for col in ['playtime_at_review', 'playtime_forever', 'playtime_last_two_weeks']:
+        reviews_df[col] = pd.to_numeric(reviews_df[col], errors='coerce').fillna(0).astype(int)
+
+    users_df = reviews_df[['steamid', 'num_games_owned', 'num_reviews']]
+    review_data_df = reviews_df[[
+        'appid', 'recommendationid', 'language', 'timestamp_created', 'timestamp_updated',
+        'voted_up', 'votes_up', 'votes_funny', 'weighted_vote_score', 'comment_count',
+        'steam_purchase', 'received_for_free', 'written_during_early_access',
+        'primarily_steam_deck', 'steamid', 'playtime_at_review', 'playtime_forever',
+        'playtime_last_two_weeks', 'last_played'
+    ]]
+    return users_df, review_data_df
+
+def make_review_frame(size: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a synthetic frame of extracted reviews with the dtypes produced by ReviewRecords.ReviewColumns.
+    About a third of the reviews share an author with another review.
+    """
+    rng = np.random.default_rng(seed)
+    created = NOW - rng.integers(0, 365 * 86400, size)
+    updated = created + rng.integers(0, 86400, size)
+    return pd.DataFrame({
+        'recommendationid': np.arange(100_000_000, 100_000_000 + size, dtype=np.int64),
+        'steamid': BASE_STEAMID + rng.integers(0, max(1, size * 2 // 3), size),
+        'language': pd.Series(rng.choice(LANGUAGES, size), dtype=object),
+        'timestamp_created': created,
+        'timestamp_updated': updated,
+        'voted_up': rng.random(size) < 0.8,
+        'votes_up': rng.integers(0, 500, size),
+        'votes_funny': rng.integers(0, 50, size),
+        'weighted_vote_score': rng.random(size),
+        'comment_count': rng.integers(0, 20, size),
+        'steam_purchase': rng.random(size) < 0.9,
+        'received_for_free': rng.random(size) < 0.05,
+        'written_during_early_access': rng.random(size) < 0.1,
+        'primarily_steam_deck': rng.random(size) < 0.1,
+        'num_games_owned': rng.integers(0, 2000, size),
+        'num_reviews': rng.integers(1, 300, size),
+        'playtime_forever': rng.integers(0, 100_000, size),
+        'playtime_last_two_weeks': rng.integers(0, 2000, size),
+        'playtime_at_review': rng.integers(0, 100_000, size),
+        'last_played': updated + rng.integers(0, 86400 * 30, size),
+    })
+
+def time_transform(func, df: pd.DataFrame, repeat: int) -> tuple:
+    """
+    Return the best wall time in seconds over `repeat` runs and the size of the last result in MB.
+    Every run gets its own copy of the input, since the legacy implementation mutates it.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        data = df.copy()
+        start = time.perf_counter()
+        users_df, reviews_df = func(440, data)
+        best = min(best, time.perf_counter() - start)
+    memory = (users_df.memory_usage(deep=True).sum() + reviews_df.memory_usage(deep=True).sum()) / 2 ** 20
+    return best, memory, len(users_df)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transform_review_data against the legacy implementation.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='Numbers of reviews to transform.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data.')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'impl':>10}{'seconds':>10}{'rows/s':>14}{'users':>10}{'output MB':>12}")
+    for size in args.sizes:
+        df = make_review_frame(size, args.seed)
+        for name, func in (("legacy", legacy_transform_review_data), ("schema", TransformData.transform_review_data)):
+            seconds, memory, users = time_transform(func, df, args.repeat)
+            print(f"{size:>10}{name:>10}{seconds:>10.3f}{size / seconds:>14,.0f}{users:>10}{memory:>12.1f}")
+
+if __name__ == "__main__":
+    main()
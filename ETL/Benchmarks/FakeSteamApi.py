@@ -0,0 +1,175 @@
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LANGUAGES = ["english", "schinese", "russian", "spanish", "brazilian", "german"]
+BASE_STEAMID = 76561197960265728
+NOW = 1_700_000_000
+
+class FakeSteamApi:
+    """
+    Local stand-in for the Steam `appreviews` and `GetAppList` endpoints, for offline benchmarks.
+
+    Reviews are generated deterministically from the App ID and offset, so every run serves the same data.
+    """
+
+    def __init__(self, review_count: int = 10000, app_count: int = 1000, latency: float = 0.0,
+                 error_rate: float = 0.0, retry_after: float = 0.0, seed: int = 0):
+        """
+        Configure the fake API.
+
+        Args:
+            review_count (int): Number of reviews every game has.
+            app_count (int): Number of apps returned by GetAppList.
+            latency (float): Seconds added to every response.
+            error_rate (float): Fraction of review requests answered with 429.
+            retry_after (float): Retry-After value sent with injected 429 responses (0 omits the header).
+            seed (int): Random seed for the injected errors.
+        """
+        self.review_count = review_count
+        self.app_count = app_count
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSteamApi":
+        """
+        Start serving on a free local port in a background thread.
+        """
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                api.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the server.
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def make_review(self, appid: int, index: int) -> dict:
+        """
+        Build the review at a given position, shaped like the real API response.
+        """
+        rng = random.Random(appid * 1_000_003 + index)
+        created = NOW - index * 60 - rng.randint(0, 59)
+        updated = created + rng.randint(0, 86400)
+        return {
+            "recommendationid": str(appid * 10_000_000 + index),
+            "author": {
+                "steamid": str(BASE_STEAMID + rng.randint(0, 10 * self.review_count)),
+                "num_games_owned": rng.randint(0, 2000),
+                "num_reviews": rng.randint(1, 300),
+                "playtime_forever": rng.randint(0, 100000),
+                "playtime_last_two_weeks": rng.randint(0, 2000),
+                "playtime_at_review": rng.randint(0, 100000),
+                "last_played": updated + rng.randint(0, 86400 * 30),
+            },
+            "language": rng.choice(LANGUAGES),
+            "review": "A synthetic review body. " * rng.randint(1, 20),
+            "timestamp_created": created,
+            "timestamp_updated": updated,
+            "voted_up": rng.random() < 0.8,
+            "votes_up": rng.randint(0, 500),
+            "votes_funny": rng.randint(0, 50),
+            "weighted_vote_score": f"{rng.random():.6f}",
+            "comment_count": rng.randint(0, 20),
+            "steam_purchase": rng.random() < 0.9,
+            "received_for_free": rng.random() < 0.05,
+            "written_during_early_access": rng.random() < 0.1,
+            "primarily_steam_deck": rng.random() < 0.1,
+        }
+
+    def reviews_payload(self, appid: int, query: dict) -> dict:
+        per_page = min(int(query.get("num_per_page", ["20"])[0]), 100)
+        cursor = query.get("cursor", [None])[0]
+        if cursor is not None:
+            offset = 0 if cursor == "*" else int(base64.urlsafe_b64decode(cursor.encode()).decode())
+        else:
+            offset = int(query.get("start_offset", ["0"])[0])
+
+        end = min(offset + per_page, self.review_count)
+        reviews = [self.make_review(appid, index) for index in range(offset, end)]
+        payload = {
+            "success": 1,
+            "query_summary": {"num_reviews": len(reviews)},
+            "reviews": reviews,
+            "cursor": base64.urlsafe_b64encode(str(end).encode()).decode(),
+        }
+        if offset == 0:
+            payload["query_summary"]["total_reviews"] = self.review_count
+        return payload
+
+    def app_list_payload(self) -> dict:
+        apps = [{"appid": 10 + index, "name": f"Synthetic Game {index}"} for index in range(self.app_count)]
+        return {"applist": {"apps": apps}}
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        """
+        Answer one request.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        url = urlparse(request.path)
+        query = parse_qs(url.query)
+
+        with self.random_lock:
+            self.requests += 1
+            throttled = url.path.startswith("/appreviews/") and self.random.random() < self.error_rate
+            if throttled:
+                self.rate_limited += 1
+
+        if throttled:
+            request.send_response(429)
+            if self.retry_after:
+                request.send_header("Retry-After", str(self.retry_after))
+            request.send_header("Content-Length", "0")
+            request.end_headers()
+            return
+
+        if url.path.startswith("/appreviews/"):
+            payload = self.reviews_payload(int(url.path.rsplit("/", 1)[-1]), query)
+        elif url.path.startswith("/ISteamApps/GetAppList/"):
+            payload = self.app_list_payload()
+        else:
+            request.send_response(404)
+            request.send_header("Content-Length", "0")
+            request.end_headers()
+            return
+
+        body = json.dumps(payload).encode()
+        request.send_response(200)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
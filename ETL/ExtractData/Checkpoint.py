@@ -0,0 +1,66 @@
+import json
+import os
+import shutil
+
+DEFAULT_SPOOL_DIR = os.path.join(os.path.expanduser("~"), ".steam_etl", "spool")
+
+class PageSpool:
+    """
+    On-disk spool of fetched review pages for one game, so an interrupted extraction can be resumed.
+
+    Each page is stored as its own JSON file together with the offset or cursor needed to fetch the next page.
+    """
+
+    def __init__(self, spool_dir: str, gameid):
+        """
+        Initialize the spool for a game.
+
+        Args:
+            spool_dir (str): Root spool directory shared by all games.
+            gameid (int): Steam App ID of the game.
+        """
+        self.directory = os.path.join(spool_dir, str(gameid))
+
+    def _page_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"page_{index:06d}.json")
+
+    def pages(self):
+        """
+        Iterate over the spooled pages in fetch order.
+
+        Yields:
+            dict: A page with 'index', 'reviews' and the 'next_offset' or 'next_cursor' it was saved with.
+        """
+        if not os.path.isdir(self.directory):
+            return
+
+        for name in sorted(os.listdir(self.directory)):
+            if not (name.startswith("page_") and name.endswith(".json")):
+                continue
+            with open(os.path.join(self.directory, name)) as f:
+                yield json.load(f)
+
+    def write(self, index: int, reviews: list, next_offset: int = None, next_cursor: str = None):
+        """
+        Atomically write one fetched page.
+
+        Args:
+            index (int): Position of the page in the fetch, starting at 0.
+            reviews (list): The page's reviews (as dicts).
+            next_offset (int, optional): Offset of the next page for offset pagination.
+            next_cursor (str, optional): Cursor of the next page for cursor pagination.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        page = {"index": index, "reviews": reviews, "next_offset": next_offset, "next_cursor": next_cursor}
+
+        path = self._page_path(index)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(page, f)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """
+        Delete every spooled page of the game.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
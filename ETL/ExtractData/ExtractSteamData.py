@@ -1,14 +1,61 @@
+import re
+import numpy as np
 import pandas as pd
 import requests
+from Monitoring.RunMetrics import metrics
+import ExtractData.HttpClient as HttpClient
+from ExtractData.JsonStream import iter_array_items
 import ExtractData.Pagination as Pagination
-import re
-import numpy as np
+from ExtractData.ReviewRecords import ReviewColumns
+
+APP_LIST_URL = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
+INVALID_CHARACTERS = r"[^A-Za-z0-9\s\-\.,!?]"
+NON_TEXT_TYPES = {"boolean", "integer", "floating", "mixed-integer-float", "decimal", "empty"}
+INVALID_CHARACTERS_RE = re.compile(INVALID_CHARACTERS)
+WHITESPACE_RE = re.compile(r"\s+")
+
+def is_text_column(series: pd.Series) -> bool:
+    """
+    Decide whether a column holds text that should go through string cleaning.
+
+    Args:
+        series (pd.Series): The column to inspect.
+
+    Returns:
+        bool: True for object/string columns whose values are not purely numeric or boolean.
+    """
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return False
+    return pd.api.types.infer_dtype(series, skipna=True) not in NON_TEXT_TYPES
+
+def clean_text_column(series: pd.Series) -> pd.Series:
+    """
+    Remove invalid characters, collapse whitespace and lowercase a text column using vectorized string operations.
+
+    Args:
+        series (pd.Series): The text column to clean.
+
+    Returns:
+        pd.Series: The cleaned column, with empty strings replaced by NA.
+    """
+    present = series.notna()
+    cleaned = (
+        series[present].astype(str)
+        .str.replace(INVALID_CHARACTERS, "", regex=True)
+        .str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.lower()
+    )
+    cleaned = cleaned.mask(cleaned == "")
+    return series.where(~present, cleaned)
 
 def clean_data(data: list, row_na_threshold: float = 0.5, col_na_threshold: float = 0.8) -> pd.DataFrame:
     """
     Clean a list of dictionaries by removing invalid characters, standardizing text,
     and handling missing values and duplicates.
 
+    Only text columns are cleaned; numeric and boolean columns keep their native dtypes.
+
     Args:
         data (list): List of dictionaries (raw API data).
         row_na_threshold (float): Minimum non-null ratio for rows to keep.
@@ -17,16 +64,18 @@ def clean_data(data: list, row_na_threshold: float = 0.5, col_na_threshold: floa
     Returns:
         pd.DataFrame: Cleaned DataFrame.
     """
-    df = pd.DataFrame(data)
+    with metrics.stage("extract.clean", rows_in=len(data)) as stage:
+        df = pd.DataFrame(data)
+
+        for column in df.columns:
+            if is_text_column(df[column]):
+                df[column] = clean_text_column(df[column])
 
-    df = df.map(lambda x: re.sub(r"[^A-Za-z0-9\s\-\.,!?]", "", str(x)) if pd.notna(x) else x)
-    df = df.map(lambda x: re.sub(r'\s+', ' ', x.strip()) if isinstance(x, str) else x)
-    df = df.map(lambda x: x.lower() if isinstance(x, str) else x)
-    df.replace("", pd.NA, inplace=True)
-    df.dropna(axis=0, thresh=int(row_na_threshold * df.shape[1]), inplace=True)
-    df.dropna(axis=1, thresh=int((1 - col_na_threshold) * df.shape[0]), inplace=True)
-    df.fillna(0, inplace=True)
-    df.drop_duplicates(inplace=True)
+        df.dropna(axis=0, thresh=int(row_na_threshold * df.shape[1]), inplace=True)
+        df.dropna(axis=1, thresh=int((1 - col_na_threshold) * df.shape[0]), inplace=True)
+        df.fillna(0, inplace=True)
+        df.drop_duplicates(inplace=True)
+        stage.rows_out = len(df)
 
     return df
 
@@ -40,14 +89,90 @@ def fetch_all_steam_games() -> pd.DataFrame:
     Raises:
         Exception: If the request to Steam API fails.
     """
-    response = requests.get("https://api.steampowered.com/ISteamApps/GetAppList/v2/")
-    data = None
-    if response.status_code == 200:
-        data = response.json().get('applist', {}).get('apps', [])
-    else:
-        raise Exception("Failed to fetch Steam games")
-    data = clean_data(data)
-    return data
+    batches = list(iter_all_steam_games())
+    if not batches:
+        return pd.DataFrame({'appid': pd.Series(dtype='int64'), 'name': pd.Series(dtype=object)})
+    return pd.concat(batches, ignore_index=True)
+
+def clean_text(value) -> str:
+    """
+    Clean a single string the same way clean_text_column cleans a column.
+
+    Args:
+        value: The raw value.
+
+    Returns:
+        str: The cleaned text, or None if nothing is left.
+    """
+    if value is None:
+        return None
+    cleaned = WHITESPACE_RE.sub(" ", INVALID_CHARACTERS_RE.sub("", str(value)).strip()).lower()
+    return cleaned or None
+
+class AppIdSet:
+    """
+    Set of App IDs stored as a bitmap: one bit per possible ID instead of a Python int per member.
+    """
+    __slots__ = ('bits',)
+
+    def __init__(self, capacity: int = 1 << 22):
+        self.bits = bytearray(capacity >> 3)
+
+    def add(self, appid: int) -> bool:
+        """
+        Add an App ID.
+
+        Returns:
+            bool: False if the App ID was already present.
+        """
+        index, mask = appid >> 3, 1 << (appid & 7)
+        if index >= len(self.bits):
+            self.bits.extend(bytes(max(index + 1, 2 * len(self.bits)) - len(self.bits)))
+        if self.bits[index] & mask:
+            return False
+        self.bits[index] |= mask
+        return True
+
+def iter_all_steam_games(batch_size: int = 10000):
+    """
+    Stream the list of all games available on Steam in fixed-size batches.
+
+    The response body is parsed incrementally, names are cleaned as they arrive and duplicate App IDs
+    are skipped, so memory use does not grow with the size of the app list. Apps without a usable name
+    get the name '0', matching clean_data's fillna(0).
+
+    Args:
+        batch_size (int): Number of games per yielded batch.
+
+    Yields:
+        pd.DataFrame: Batches with 'appid' and 'name' columns.
+
+    Raises:
+        Exception: If the request to Steam API fails.
+    """
+    try:
+        chunks = HttpClient.get_client().stream(APP_LIST_URL)
+        seen = AppIdSet()
+        appids = np.empty(batch_size, dtype=np.int64)
+        names = []
+
+        for app in iter_array_items(chunks, 'apps'):
+            appid = app.get('appid') if isinstance(app, dict) else None
+            if not isinstance(appid, int) or appid < 0 or not seen.add(appid):
+                continue
+
+            appids[len(names)] = appid
+            names.append(clean_text(app.get('name')) or '0')
+            if len(names) == batch_size:
+                metrics.add("extract.games", rows_out=batch_size)
+                yield pd.DataFrame({'appid': appids.copy(), 'name': names})
+                names = []
+
+        if names:
+            metrics.add("extract.games", rows_out=len(names))
+            yield pd.DataFrame({'appid': appids[:len(names)].copy(), 'name': names})
+    except (HttpClient.RetryError, requests.RequestException, ValueError) as e:
+        raise Exception(f"Failed to fetch Steam games: {e}") from e
 
 def fetch_game_reviews(gameid: str, review_limit: int = None) -> pd.DataFrame:
     """
@@ -70,3 +195,110 @@ def fetch_game_reviews(gameid: str, review_limit: int = None) -> pd.DataFrame:
     
     data = clean_data(data)
     return data
+
+def build_review_frame(columns: ReviewColumns) -> pd.DataFrame:
+    """
+    Turn a buffer of typed review columns into a DataFrame and clean its text column.
+
+    Args:
+        columns (ReviewColumns): The buffered reviews.
+
+    Returns:
+        pd.DataFrame: Reviews with native numeric, boolean and text dtypes.
+    """
+    with metrics.stage("extract.clean", rows_in=len(columns)) as stage:
+        df = columns.to_frame()
+        df['language'] = clean_text_column(df['language'])
+        stage.rows_out = len(df)
+    return df
+
+def chunk_review_pages(gameid: str, pages, chunk_size: int = 1000, allow_empty: bool = False):
+    """
+    Regroup pages of raw reviews into typed, cleaned, fixed-size chunks.
+
+    Reviews are packed into typed columns as they arrive and only one chunk is buffered at a time,
+    so memory use stays bounded regardless of how many reviews the game has.
+
+    Args:
+        gameid (str): Steam App ID of the game.
+        pages (iterable): Lists of raw review dicts, as yielded by the Pagination generators.
+        chunk_size (int): Number of reviews per yielded chunk.
+        allow_empty (bool): Whether a game without any reviews is a valid result.
+
+    Yields:
+        pd.DataFrame: DataFrame of up to `chunk_size` reviews in the ReviewRecords.REVIEW_SCHEMA columns.
+
+    Raises:
+        Exception: If the fetch fails, or if no reviews are returned and `allow_empty` is False.
+    """
+    columns = ReviewColumns()
+    yielded_any = False
+
+    try:
+        for reviews in pages:
+            for review in reviews:
+                columns.append(review)
+                if len(columns) >= chunk_size:
+                    yielded_any = True
+                    yield build_review_frame(columns)
+                    columns = ReviewColumns()
+    except Pagination.PaginationError as e:
+        raise Exception(f"Failed to fetch reviews for game with ID: {gameid}") from e
+
+    if len(columns):
+        yielded_any = True
+        yield build_review_frame(columns)
+
+    if not yielded_any and not allow_empty:
+        raise Exception(f"Failed to fetch reviews for game with ID: {gameid}")
+
+def stream_game_reviews(gameid: str, review_limit: int = None, chunk_size: int = 1000, spool=None,
+                        resume: bool = False, windows: int = 1):
+    """
+    Fetch reviews for a specific game page by page and yield them as cleaned, fixed-size chunks.
+
+    With more than one window, the game's review offsets are split into that many ranges fetched
+    concurrently (see Pagination.iter_windowed_pages); pages are then not spooled.
+
+    Args:
+        gameid (str): Steam App ID of the game.
+        review_limit (int, optional): Max number of reviews to fetch.
+        chunk_size (int): Number of reviews per yielded chunk.
+        spool (ExtractData.Checkpoint.PageSpool, optional): Spool every fetched page is written to.
+        resume (bool): Continue from the pages already in the spool.
+        windows (int): Number of offset ranges fetched concurrently.
+
+    Yields:
+        pd.DataFrame: Cleaned DataFrame of up to `chunk_size` reviews. Nothing is yielded if the game has no reviews.
+
+    Raises:
+        Exception: If the fetch fails.
+    """
+    if windows > 1:
+        pages = Pagination.iter_windowed_pages(gameid, review_limit, windows)
+    else:
+        pages = Pagination.iter_offset_pages(gameid, review_limit, spool, resume)
+    yield from chunk_review_pages(gameid, pages, chunk_size, allow_empty=True)
+
+def stream_updated_reviews(gameid: str, since_timestamp: int, review_limit: int = None, chunk_size: int = 1000,
+                           state: dict = None, cursor: str = "*"):
+    """
+    Fetch only reviews updated after `since_timestamp`, newest first, as cleaned, fixed-size chunks.
+
+    Args:
+        gameid (str): Steam App ID of the game.
+        since_timestamp (int): Unix time of the newest review already ingested.
+        review_limit (int, optional): Max number of reviews to fetch.
+        chunk_size (int): Number of reviews per yielded chunk.
+        state (dict, optional): Receives the last cursor, whether the review limit cut the fetch short
+            and the newest `timestamp_updated` seen.
+        cursor (str): Cursor to start from, e.g. where a fetch cut short by the review limit stopped.
+
+    Yields:
+        pd.DataFrame: Cleaned DataFrame of up to `chunk_size` reviews. Nothing is yielded if the game is up to date.
+
+    Raises:
+        Exception: If the fetch fails.
+    """
+    pages = Pagination.iter_updated_pages(gameid, since_timestamp, review_limit, state, cursor)
+    yield from chunk_review_pages(gameid, pages, chunk_size, allow_empty=True)
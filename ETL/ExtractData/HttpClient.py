@@ -0,0 +1,291 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from Monitoring.RunMetrics import metrics
+
+INITIAL_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class RetryError(Exception):
+    """Raised when a request still fails after the maximum number of attempts."""
+
+def parse_retry_after(value) -> float:
+    """
+    Parse a Retry-After header given either as delta-seconds or as an HTTP date.
+
+    Args:
+        value (str): The raw header value.
+
+    Returns:
+        float: Seconds to wait, or 0 if the header is missing or invalid.
+    """
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
+
+class HttpClient:
+    """
+    Shared HTTP client with pooled keep-alive connections, bounded retries and an optional on-disk cache.
+    """
+
+    def __init__(self, timeout: tuple = (5.0, 30.0), max_attempts: int = 6, initial_backoff: float = INITIAL_BACKOFF,
+                 max_backoff: float = MAX_BACKOFF, pool_size: int = 16, cache_dir: str = None, cache_ttl: float = None,
+                 rate_limiter=None):
+        """
+        Initialize the client.
+
+        Args:
+            timeout (tuple): (connect, read) timeouts in seconds.
+            max_attempts (int): Maximum number of attempts per request, including the first one.
+            initial_backoff (float): Backoff in seconds after the first failed attempt; doubles every attempt.
+            max_backoff (float): Upper bound of a single backoff.
+            pool_size (int): Number of keep-alive connections kept per host.
+            cache_dir (str, optional): Directory for cached successful responses. Caching is disabled if not set.
+            cache_ttl (float, optional): Maximum age of a cached response in seconds. Cached responses never expire if not set.
+            rate_limiter (TokenBucket, optional): Shared rate limiter acquired before every request.
+        """
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with jitter for the given attempt number.
+
+        Args:
+            attempt (int): The attempt that just failed, starting at 1.
+
+        Returns:
+            float: Seconds to wait before the next attempt.
+        """
+        delay = min(self.initial_backoff * 2 ** (attempt - 1), self.max_backoff)
+        return delay + random.uniform(0, delay / 2)
+
+    def wait(self, seconds: float, rate_limited: bool = False):
+        """
+        Wait before retrying.
+
+        Only a 429 says the whole client is sending too fast, so only then is the shared rate limiter
+        paused for every thread and worker process. Connection errors and 5xx responses concern a single
+        request and only delay the calling thread.
+
+        Args:
+            seconds (float): Seconds to wait.
+            rate_limited (bool): Whether the server answered 429.
+        """
+        metrics.add("extract.http", sleep_seconds=seconds)
+        if rate_limited and self.rate_limiter is not None:
+            self.rate_limiter.pause(seconds)
+        else:
+            time.sleep(seconds)
+
+    def get(self, url: str) -> requests.Response:
+        """
+        GET a URL, retrying connection errors, 429 and 5xx responses with exponential backoff.
+
+        Args:
+            url (str): The URL to request.
+
+        Returns:
+            requests.Response: The final response. Non-retryable error statuses are returned as-is.
+
+        Raises:
+            RetryError: If every attempt failed.
+        """
+        cached = self._read_cache(url)
+        if cached is not None:
+            metrics.add("extract.http", cache_hits=1)
+            return cached
+
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                metrics.add("extract.http", retries=1)
+            if self.rate_limiter is not None:
+                metrics.add("extract.http", rate_limit_wait=self.rate_limiter.acquire())
+
+            try:
+                with metrics.stage("extract.http"):
+                    response = self.session.get(url, timeout=self.timeout)
+                metrics.add("extract.http", bytes_downloaded=len(response.content))
+            except requests.exceptions.RequestException as e:
+                delay = self.backoff(attempt)
+                print(f"Request error: {e}. Retrying in {delay:.2f} seconds.\n")
+                self.wait(delay)
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES:
+                delay = parse_retry_after(response.headers.get("Retry-After")) or self.backoff(attempt)
+                if response.status_code == 429:
+                    print(f"Rate limited (429). Retrying after {delay:.2f} seconds.\n")
+                else:
+                    print(f"Server error ({response.status_code}). Retrying after {delay:.2f} seconds.\n")
+                self.wait(delay, response.status_code == 429)
+                continue
+
+            if response.status_code == 200:
+                self._write_cache(url, response.content)
+            return response
+
+        raise RetryError(f"Giving up on {url} after {self.max_attempts} attempts")
+
+    def stream(self, url: str, chunk_size: int = 65536):
+        """
+        GET a URL and yield its body in chunks instead of holding it in memory.
+
+        Connecting is retried like get(). Once the body is being read, errors are raised to the caller.
+        With a cache directory the body is written to the cache as it streams and served from it next time.
+
+        Args:
+            url (str): The URL to request.
+            chunk_size (int): Maximum size of a yielded chunk in bytes.
+
+        Yields:
+            bytes: Consecutive pieces of the response body.
+
+        Raises:
+            RetryError: If every attempt failed.
+            requests.HTTPError: If the server answered with a non-retryable error status.
+        """
+        cache_path = self._cache_path(url) if self.cache_dir else None
+        cached = None
+        if cache_path is not None:
+            try:
+                if self.cache_ttl is None or time.time() - os.path.getmtime(cache_path) <= self.cache_ttl:
+                    cached = open(cache_path, "rb")
+            except OSError:
+                cached = None
+
+        if cached is not None:
+            metrics.add("extract.http", cache_hits=1)
+            with cached:
+                while True:
+                    chunk = cached.read(chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk
+
+        response = None
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                metrics.add("extract.http", retries=1)
+            if self.rate_limiter is not None:
+                metrics.add("extract.http", rate_limit_wait=self.rate_limiter.acquire())
+
+            try:
+                with metrics.stage("extract.http"):
+                    response = self.session.get(url, timeout=self.timeout, stream=True)
+            except requests.exceptions.RequestException as e:
+                delay = self.backoff(attempt)
+                print(f"Request error: {e}. Retrying in {delay:.2f} seconds.\n")
+                self.wait(delay)
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES:
+                response.close()
+                delay = parse_retry_after(response.headers.get("Retry-After")) or self.backoff(attempt)
+                print(f"Server returned {response.status_code}. Retrying after {delay:.2f} seconds.\n")
+                self.wait(delay, response.status_code == 429)
+                continue
+            break
+        else:
+            raise RetryError(f"Giving up on {url} after {self.max_attempts} attempts")
+
+        with response:
+            response.raise_for_status()
+            cache_file = None
+            if cache_path is not None:
+                tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                cache_file = open(tmp_path, "wb")
+            try:
+                for chunk in response.iter_content(chunk_size):
+                    metrics.add("extract.http", bytes_downloaded=len(chunk))
+                    if cache_file is not None:
+                        cache_file.write(chunk)
+                    yield chunk
+            except BaseException:
+                if cache_file is not None:
+                    cache_file.close()
+                    os.remove(tmp_path)
+                raise
+            if cache_file is not None:
+                cache_file.close()
+                os.replace(tmp_path, cache_path)
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest())
+
+    def _read_cache(self, url: str):
+        if not self.cache_dir:
+            return None
+
+        path = self._cache_path(url)
+        try:
+            if self.cache_ttl is not None and time.time() - os.path.getmtime(path) > self.cache_ttl:
+                return None
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = content
+        return response
+
+    def _write_cache(self, url: str, content: bytes):
+        if not self.cache_dir:
+            return
+
+        path = self._cache_path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+_client = None
+
+def get_client() -> HttpClient:
+    """
+    Return the shared HTTP client, creating one with default settings on first use.
+    """
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
+
+def configure(**kwargs) -> HttpClient:
+    """
+    Replace the shared HTTP client with one built from the given HttpClient arguments.
+
+    Returns:
+        HttpClient: The new shared client.
+    """
+    global _client
+    _client = HttpClient(**kwargs)
+    return _client
@@ -0,0 +1,77 @@
+import codecs
+import json
+import re
+
+WHITESPACE = re.compile(r"[\s,]*")
+
+def iter_array_items(chunks, key: str, buffer_limit: int = 1 << 20):
+    """
+    Incrementally parse the elements of the first JSON array stored under `key`.
+
+    Only the unparsed tail of the body is buffered, so memory stays bounded by the largest element
+    plus one chunk no matter how long the array is.
+
+    Args:
+        chunks (iterable): Consecutive pieces of a UTF-8 encoded JSON document, as bytes.
+        key (str): Name of the object member holding the array, e.g. 'apps'.
+        buffer_limit (int): Characters of already parsed input kept before the buffer is compacted.
+
+    Yields:
+        The decoded array elements, in order.
+
+    Raises:
+        ValueError: If the document ends before the array does or contains malformed JSON.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    marker = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    chunks = iter(chunks)
+    buffer = ""
+    position = None
+    exhausted = False
+
+    def read_more() -> bool:
+        nonlocal buffer, exhausted
+        for chunk in chunks:
+            buffer += text_decoder.decode(chunk)
+            return True
+        buffer += text_decoder.decode(b"", final=True)
+        exhausted = True
+        return False
+
+    while position is None:
+        match = marker.search(buffer)
+        if match:
+            position = match.end()
+            break
+        buffer = buffer[-(len(key) + 64):]
+        if not read_more():
+            raise ValueError(f"JSON document has no array under '{key}'.")
+
+    while True:
+        position = WHITESPACE.match(buffer, position).end()
+        if position >= len(buffer):
+            if not read_more():
+                raise ValueError(f"JSON document ended inside the '{key}' array.")
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise ValueError(f"Malformed element in the '{key}' array at offset {position}.")
+            read_more()
+            continue
+
+        if end == len(buffer) and not exhausted:
+            # A number at the end of the buffer may continue in the next chunk.
+            read_more()
+            continue
+
+        yield item
+        position = end
+        if position > buffer_limit:
+            buffer = buffer[position:]
+            position = 0
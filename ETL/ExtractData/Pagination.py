@@ -1,40 +1,33 @@
-import requests
-import time
-import random
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+import ExtractData.HttpClient as HttpClient
 
 BASE_URL = "https://store.steampowered.com/appreviews/"
-INITIAL_BACKOFF = 1.0    
-MAX_BACKOFF = 60.0      
+# Reviews requested per page; Steam serves at most 100.
+PAGE_SIZE = 100
 
-def fetch_reviews(url, seen_review_ids, attempt=1):
+class PaginationError(Exception):
+    """Raised when a review page cannot be fetched and pagination has to stop."""
+
+def fetch_reviews(url, seen_review_ids):
     """
-    Fetch review data from a given Steam API URL with retry logic and exponential backoff.
+    Fetch review data from a given Steam API URL through the shared HTTP client,
+    which retries failed requests with bounded exponential backoff.
 
     Args:
         url (str): The full URL to request reviews from.
         seen_review_ids (set): A set of already seen review IDs to prevent duplicates.
-        attempt (int): The current attempt number for exponential backoff.
 
     Returns:
         tuple: (reviews: list, data: dict) if successful; (None, None) otherwise.
     """
     try:
-        response = requests.get(url)
-    except requests.exceptions.RequestException as e:
-        backoff = min(INITIAL_BACKOFF * 2 ** (attempt - 1), MAX_BACKOFF)
-        jitter = random.uniform(0, 0.5)
-        print(f"Request error: {e}. Retrying in {backoff + jitter:.2f} seconds.\n")
-        time.sleep(backoff + jitter)
-        return fetch_reviews(url, seen_review_ids, attempt + 1)
-
-    if response.status_code == 429:
-        retry_after = int(response.headers.get("Retry-After", 0))
-        if retry_after == 0:
-            retry_after = min(INITIAL_BACKOFF * 2 ** (attempt - 1), MAX_BACKOFF)
-        jitter = random.uniform(0, 0.5)
-        print(f"Rate limited (429). Retrying after {retry_after + jitter:.2f} seconds.\n")
-        time.sleep(retry_after + jitter)
-        return fetch_reviews(url, seen_review_ids, attempt + 1)
+        response = HttpClient.get_client().get(url)
+    except HttpClient.RetryError as e:
+        print(f"{e}\n")
+        return None, None
 
     if response.status_code != 200:
         print(f"Error fetching reviews: {response.status_code}\n")
@@ -66,87 +59,365 @@ def fetch_reviews(url, seen_review_ids, attempt=1):
 
     return reviews, data
 
-def cursor_pagination(gameid: str, review_limit: int = None):
+def replay_spool(spool, seen_review_ids: set):
     """
-    Fetch reviews for a game using cursor-based pagination from the Steam API.
+    Yield the pages saved in a spool, marking their reviews as seen.
+
+    Args:
+        spool (ExtractData.Checkpoint.PageSpool): The spool to replay.
+        seen_review_ids (set): Updated with the IDs of every replayed review.
+
+    Yields:
+        dict: Each spooled page.
+    """
+    for page in spool.pages():
+        seen_review_ids.update(review.get('recommendationid') for review in page['reviews'])
+        yield page
+
+def iter_cursor_pages(gameid: str, review_limit: int = None, spool=None, resume: bool = False):
+    """
+    Lazily fetch review pages for a game using cursor-based pagination from the Steam API.
 
     Args:
         gameid (str): The App ID of the game.
         review_limit (int, optional): Maximum number of reviews to fetch.
+        spool (ExtractData.Checkpoint.PageSpool, optional): Spool every fetched page is written to.
+        resume (bool): Replay the spooled pages and continue after the last one instead of starting over.
 
-    Returns:
-        list: A list of all collected reviews (as dicts), or None if an error occurred.
+    Yields:
+        list: The new reviews (as dicts) of each fetched page.
+
+    Raises:
+        PaginationError: If a page could not be fetched.
     """
-    all_reviews = []
     seen_review_ids = set()
     seen_cursors = set()
     cursor = "*"
-    per_page = 100
+    per_page = PAGE_SIZE
+    fetched = 0
+    page_index = 0
+
+    if spool is not None and resume:
+        for page in replay_spool(spool, seen_review_ids):
+            yield page['reviews']
+            fetched += len(page['reviews'])
+            cursor = page['next_cursor']
+            seen_cursors.add(cursor)
+            page_index = page['index'] + 1
+        if page_index:
+            print(f"Resumed game {gameid} after {page_index} spooled pages.\n")
+    elif spool is not None:
+        spool.clear()
 
     while True:
-        url = f"{BASE_URL}{gameid}?json=1&num_per_page={per_page}&cursor={cursor}&filter=all&day_range=365"
+        if review_limit and fetched >= review_limit:
+            print(f"Reached review limit of {review_limit}. Stopping.\n")
+            break
+
+        url = f"{BASE_URL}{gameid}?json=1&num_per_page={per_page}&cursor={quote(cursor, safe='*')}&filter=all&day_range=365"
 
         reviews, data = fetch_reviews(url, seen_review_ids)
-        if reviews == "retry":
-            continue
         if reviews is None:
-            return None
+            raise PaginationError(f"Failed to fetch reviews page for game {gameid} at cursor {cursor}")
         if not reviews:
             print("No reviews found. Stopping pagination.\n")
             break
 
-        all_reviews.extend(reviews)
+        next_cursor = data.get('cursor')
+        if spool is not None:
+            spool.write(page_index, reviews, next_cursor=next_cursor)
+        page_index += 1
 
-        if review_limit and len(all_reviews) >= review_limit:
-            print(f"Reached review limit of {review_limit}. Stopping.\n")
-            break
+        yield reviews
+        fetched += len(reviews)
 
-        cursor = data.get('cursor')
+        cursor = next_cursor
         if cursor in seen_cursors or not cursor:
             print("No more pages available. Stopping.\n")
             break
 
         seen_cursors.add(cursor)
 
-    return all_reviews
-
-def offset_pagination(gameid: str, review_limit: int = None):
+def iter_offset_pages(gameid: str, review_limit: int = None, spool=None, resume: bool = False):
     """
-    Fetch reviews for a game using offset-based pagination from the Steam API.
+    Lazily fetch review pages for a game using offset-based pagination from the Steam API.
 
     Args:
         gameid (str): The App ID of the game.
         review_limit (int, optional): Maximum number of reviews to fetch.
+        spool (ExtractData.Checkpoint.PageSpool, optional): Spool every fetched page is written to.
+        resume (bool): Replay the spooled pages and continue after the last one instead of starting over.
 
-    Returns:
-        list: A list of all collected reviews (as dicts), or None if an error occurred.
+    Yields:
+        list: The new reviews (as dicts) of each fetched page.
+
+    Raises:
+        PaginationError: If a page could not be fetched.
     """
-    all_reviews = []
     seen_review_ids = set()
     total_reviews = 0
-    per_page = 100
+    per_page = PAGE_SIZE
+    page_index = 0
+
+    if spool is not None and resume:
+        for page in replay_spool(spool, seen_review_ids):
+            yield page['reviews']
+            total_reviews = page['next_offset']
+            page_index = page['index'] + 1
+        if page_index:
+            print(f"Resumed game {gameid} after {page_index} spooled pages at offset {total_reviews}.\n")
+    elif spool is not None:
+        spool.clear()
 
     while True:
+        if review_limit and total_reviews >= review_limit:
+            print(f"Reached review limit of {review_limit}. Stopping.\n")
+            break
+
         url = f"{BASE_URL}{gameid}?json=1&num_per_page={per_page}&start_offset={total_reviews}&filter=all&day_range=365"
 
         reviews, _ = fetch_reviews(url, seen_review_ids)
-        if reviews == "retry":
-            continue
         if reviews is None:
-            return None
+            raise PaginationError(f"Failed to fetch reviews page for game {gameid} at offset {total_reviews}")
         if not reviews:
             print("No more reviews available. Stopping.\n")
             break
 
-        all_reviews.extend(reviews)
+        total_reviews += len(reviews)
+        if spool is not None:
+            spool.write(page_index, reviews, next_offset=total_reviews)
+        page_index += 1
 
-        if review_limit and len(all_reviews) >= review_limit:
-            print(f"Reached review limit of {review_limit}. Stopping.\n")
-            break
+        yield reviews
 
-        total_reviews += len(reviews)
         if len(reviews) < per_page:
             print("No more pages available. Stopping.\n")
             break
 
+def offset_url(gameid: str, offset: int, per_page: int = 100) -> str:
+    """
+    Build the URL of one offset-paginated review page.
+
+    Args:
+        gameid (str): The App ID of the game.
+        offset (int): Index of the first review of the page.
+        per_page (int): Number of reviews requested (at most 100).
+
+    Returns:
+        str: The request URL.
+    """
+    return f"{BASE_URL}{gameid}?json=1&num_per_page={per_page}&start_offset={offset}&filter=all&day_range=365"
+
+def split_windows(start: int, end: int, windows: int, per_page: int = 100) -> list:
+    """
+    Split the offsets [start, end) into at most `windows` contiguous ranges aligned to whole pages.
+
+    Args:
+        start (int): First offset.
+        end (int): Offset after the last review.
+        windows (int): Maximum number of ranges.
+        per_page (int): Page size the range boundaries are aligned to.
+
+    Returns:
+        list: (start, end) tuples covering the offsets in order.
+    """
+    pages = -(-(end - start) // per_page)
+    pages_per_window = max(1, -(-pages // windows))
+    step = pages_per_window * per_page
+    return [(offset, min(offset + step, end)) for offset in range(start, end, step)]
+
+def iter_windowed_pages(gameid: str, review_limit: int = None, windows: int = 4):
+    """
+    Fetch a game's reviews by splitting the offset space into windows that are fetched concurrently.
+
+    The first page reports the game's total review count in its query_summary. The remaining offsets
+    are split into `windows` ranges, each paged through by its own thread. The last page of every range
+    only requests the reviews left in it, so ranges never overlap. All requests go through the shared
+    HTTP client and its rate limiter. Pages are yielded as they arrive, not in offset order, and
+    reviews seen in an earlier page are dropped.
+
+    Args:
+        gameid (str): The App ID of the game.
+        review_limit (int, optional): Maximum number of reviews to fetch.
+        windows (int): Number of ranges fetched at the same time.
+
+    Yields:
+        list: The new reviews (as dicts) of each fetched page.
+
+    Raises:
+        PaginationError: If a page could not be fetched.
+    """
+    seen_review_ids = set()
+    per_page = PAGE_SIZE
+
+    reviews, data = fetch_reviews(offset_url(gameid, 0, per_page), seen_review_ids)
+    if reviews is None:
+        raise PaginationError(f"Failed to fetch reviews page for game {gameid} at offset 0")
+    if review_limit:
+        reviews = reviews[:review_limit]
+    if not reviews:
+        print("No more reviews available. Stopping.\n")
+        return
+    yield reviews
+
+    start = len(data.get('reviews', []))
+    total = (data.get('query_summary') or {}).get('total_reviews') or 0
+    end = min(total, review_limit) if review_limit else total
+    if start < per_page or start >= end:
+        return
+
+    results = queue.Queue(maxsize=4 * windows)
+    stop = threading.Event()
+    done = object()
+
+    def fetch_window(window_start: int, window_end: int):
+        window_seen = set()
+        offset = window_start
+        try:
+            while offset < window_end and not stop.is_set():
+                count = min(per_page, window_end - offset)
+                page, page_data = fetch_reviews(offset_url(gameid, offset, count), window_seen)
+                if page is None:
+                    results.put(PaginationError(f"Failed to fetch reviews page for game {gameid} at offset {offset}"))
+                    return
+                if page:
+                    results.put(page)
+                received = len(page_data.get('reviews', []))
+                if received < count:
+                    break
+                offset += received
+        except Exception as e:
+            results.put(PaginationError(f"Failed to fetch reviews of game {gameid} from offset {offset}: {e}"))
+        finally:
+            results.put(done)
+
+    bounds = split_windows(start, end, windows, per_page)
+    print(f"Fetching {end - start} more reviews of game {gameid} in {len(bounds)} windows.\n")
+
+    with ThreadPoolExecutor(max_workers=len(bounds)) as executor:
+        for window_start, window_end in bounds:
+            executor.submit(fetch_window, window_start, window_end)
+
+        finished = 0
+        try:
+            while finished < len(bounds):
+                item = results.get()
+                if item is done:
+                    finished += 1
+                    continue
+                if isinstance(item, PaginationError):
+                    raise item
+
+                page = []
+                for review in item:
+                    review_id = review.get('recommendationid')
+                    if review_id not in seen_review_ids:
+                        seen_review_ids.add(review_id)
+                        page.append(review)
+                if page:
+                    yield page
+        finally:
+            stop.set()
+            while finished < len(bounds):
+                if results.get() is done:
+                    finished += 1
+
+def iter_updated_pages(gameid: str, since_timestamp: int, review_limit: int = None, state: dict = None,
+                       cursor: str = "*"):
+    """
+    Lazily fetch reviews updated after a high-water mark, most recently updated first.
+
+    Pages through the Steam API with `filter=updated` and stops at the first review whose
+    `timestamp_updated` is not newer than `since_timestamp`. When the review limit stops pagination
+    before that, state['truncated'] is set and state['cursor'] is the cursor of the next page,
+    from which a later call can continue.
+
+    Args:
+        gameid (str): The App ID of the game.
+        since_timestamp (int): Unix time of the newest review already ingested.
+        review_limit (int, optional): Maximum number of reviews to fetch.
+        state (dict, optional): Updated in place with 'cursor', 'truncated' and 'newest_timestamp_updated'.
+        cursor (str): Cursor of the first page ('*' for the most recently updated review).
+
+    Yields:
+        list: The new reviews (as dicts) of each fetched page.
+
+    Raises:
+        PaginationError: If a page could not be fetched.
+    """
+    state = state if state is not None else {}
+    seen_review_ids = set()
+    seen_cursors = {cursor}
+    per_page = PAGE_SIZE
+    fetched = 0
+    state['truncated'] = False
+
+    while True:
+        url = f"{BASE_URL}{gameid}?json=1&num_per_page={per_page}&cursor={quote(cursor, safe='*')}&filter=updated"
+
+        reviews, data = fetch_reviews(url, seen_review_ids)
+        if reviews is None:
+            raise PaginationError(f"Failed to fetch reviews page for game {gameid} at cursor {cursor}")
+
+        new_reviews = [review for review in reviews if int(review.get('timestamp_updated', 0)) > since_timestamp]
+        if new_reviews:
+            newest = max(int(review['timestamp_updated']) for review in new_reviews)
+            state['newest_timestamp_updated'] = max(state.get('newest_timestamp_updated', 0), newest)
+            yield new_reviews
+            fetched += len(new_reviews)
+
+        if len(new_reviews) < len(reviews) or not reviews:
+            print(f"Reached reviews already ingested for game {gameid}. Stopping.\n")
+            break
+
+        cursor = data.get('cursor')
+        if cursor in seen_cursors or not cursor:
+            print("No more pages available. Stopping.\n")
+            break
+
+        if review_limit and fetched >= review_limit:
+            print(f"Reached review limit of {review_limit}. Stopping.\n")
+            state['truncated'] = True
+            state['cursor'] = cursor
+            break
+
+        seen_cursors.add(cursor)
+        state['cursor'] = cursor
+
+def cursor_pagination(gameid: str, review_limit: int = None):
+    """
+    Fetch reviews for a game using cursor-based pagination from the Steam API.
+
+    Args:
+        gameid (str): The App ID of the game.
+        review_limit (int, optional): Maximum number of reviews to fetch.
+
+    Returns:
+        list: A list of all collected reviews (as dicts), or None if an error occurred.
+    """
+    all_reviews = []
+    try:
+        for reviews in iter_cursor_pages(gameid, review_limit):
+            all_reviews.extend(reviews)
+    except PaginationError:
+        return None
+    return all_reviews
+
+def offset_pagination(gameid: str, review_limit: int = None):
+    """
+    Fetch reviews for a game using offset-based pagination from the Steam API.
+
+    Args:
+        gameid (str): The App ID of the game.
+        review_limit (int, optional): Maximum number of reviews to fetch.
+
+    Returns:
+        list: A list of all collected reviews (as dicts), or None if an error occurred.
+    """
+    all_reviews = []
+    try:
+        for reviews in iter_offset_pages(gameid, review_limit):
+            all_reviews.extend(reviews)
+    except PaginationError:
+        return None
     return all_reviews
@@ -0,0 +1,118 @@
+import multiprocessing
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to share one request budget between concurrent fetchers.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. A 429 response can
+    pause the whole bucket so every worker honors the server's Retry-After window.
+    """
+
+    def __init__(self, rate: float, capacity: int = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate (float): Number of requests allowed per second.
+            capacity (int, optional): Maximum burst size. Defaults to max(1, rate).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available and consume it.
+
+        Returns:
+            float: Total seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float):
+        """
+        Stop handing out tokens for the given number of seconds (e.g. from a Retry-After header).
+
+        Args:
+            seconds (float): Length of the pause.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+            self.updated_at = self.paused_until
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in shared memory, so worker processes started with
+    multiprocessing draw from one request budget.
+
+    Pass the instance to the worker processes when they are created.
+    """
+
+    def __init__(self, rate: float, capacity: int = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate (float): Number of requests allowed per second across all processes.
+            capacity (int, optional): Maximum burst size. Defaults to max(1, rate).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.state = multiprocessing.RawArray('d', [self.capacity, time.monotonic(), 0.0])
+        self.lock = multiprocessing.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self.state[0]
+
+    @tokens.setter
+    def tokens(self, value: float):
+        self.state[0] = value
+
+    @property
+    def updated_at(self) -> float:
+        return self.state[1]
+
+    @updated_at.setter
+    def updated_at(self, value: float):
+        self.state[1] = value
+
+    @property
+    def paused_until(self) -> float:
+        return self.state[2]
+
+    @paused_until.setter
+    def paused_until(self, value: float):
+        self.state[2] = value
@@ -0,0 +1,174 @@
+from sqlalchemy import bindparam, text
+
+class PostgresDialect:
+    """
+    SQL that differs between the supported databases, as used with a PostgreSQL server.
+    """
+
+    name = 'postgresql'
+    supports_copy = True
+    supports_partitions = True
+    supports_skip_locked = True
+    explain_prefix = "EXPLAIN (ANALYZE, BUFFERS)"
+    # Current time as a UTC TIMESTAMP without time zone, the type of every *_at column.
+    utc_now = "(now() AT TIME ZONE 'utc')"
+
+    def add_load_time_column(self, conn, table_name: str):
+        """
+        Add the loaded_at column to an existing table, filled with the current time on insert.
+
+        Args:
+            conn (sqlalchemy.engine.Connection): The connection to alter the table on.
+            table_name (str): The table.
+        """
+        conn.execute(text(f'ALTER TABLE "{table_name}" ADD COLUMN loaded_at TIMESTAMP DEFAULT {self.utc_now}'))
+
+    def create_staging_table(self, conn, staging_table: str, table_name: str):
+        """
+        Create an empty temporary table shaped like `table_name`, dropped when the transaction commits.
+
+        Args:
+            conn (sqlalchemy.engine.Connection): The connection to create it on.
+            staging_table (str): Name of the temporary table.
+            table_name (str): The table whose columns are copied.
+        """
+        conn.execute(text(
+            f'CREATE TEMP TABLE "{staging_table}" (LIKE "{table_name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+        ))
+
+    def drop_staging_table(self, conn, staging_table: str):
+        """
+        Drop a staging table before the transaction commits. PostgreSQL drops it on commit by itself.
+        """
+
+    def in_list(self, column: str, param: str) -> str:
+        """
+        Build a condition matching `column` against the list bound to `param`.
+
+        Args:
+            column (str): The column (or qualified column) to filter.
+            param (str): Name of the bind parameter holding the list.
+
+        Returns:
+            str: The SQL condition.
+        """
+        return f"{column} = ANY(:{param})"
+
+    def prepare(self, sql: str, params: dict = None):
+        """
+        Build a statement whose list parameters, used with in_list(), bind correctly. Lists bind as arrays here.
+
+        Args:
+            sql (str): The SQL text.
+            params (dict, optional): The parameters the statement will be executed with.
+
+        Returns:
+            sqlalchemy.sql.elements.TextClause: The statement.
+        """
+        return text(sql)
+
+    def create_data_version(self, conn):
+        """
+        Create the DATA_VERSION counter the ETL advances after every load.
+        """
+        conn.execute(text("CREATE SEQUENCE IF NOT EXISTS DATA_VERSION;"))
+
+    def bump_data_version(self, conn):
+        """
+        Advance DATA_VERSION. Does nothing if the schema has no DATA_VERSION counter.
+        """
+        conn.execute(text("SELECT nextval(to_regclass('data_version'))"))
+
+    def read_data_version(self, conn):
+        """
+        Read DATA_VERSION.
+
+        Returns:
+            int: The current data version, or None if the schema has no DATA_VERSION counter.
+        """
+        return conn.execute(text(
+            "SELECT CASE WHEN to_regclass('data_version') IS NULL THEN NULL "
+            "ELSE COALESCE(pg_sequence_last_value(to_regclass('data_version')), 0) END"
+        )).scalar()
+
+class SQLiteDialect(PostgresDialect):
+    """
+    SQL that differs between the supported databases, as used with an embedded SQLite file (3.39 or newer).
+
+    SQLite has no COPY, partitions, row locks or sequences: DataFrames are loaded with batched INSERTs,
+    REVIEWS is never partitioned, the review job queue and refresh daemon are unavailable and
+    DATA_VERSION is a one-row table.
+    """
+
+    name = 'sqlite'
+    supports_copy = False
+    supports_partitions = False
+    supports_skip_locked = False
+    explain_prefix = "EXPLAIN QUERY PLAN"
+    utc_now = "CURRENT_TIMESTAMP"
+
+    def add_load_time_column(self, conn, table_name: str):
+        # SQLite cannot add a column with a non-constant default, so inserted rows are stamped by a trigger.
+        conn.execute(text(f'ALTER TABLE "{table_name}" ADD COLUMN loaded_at TIMESTAMP'))
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS "{table_name}_loaded_at" AFTER INSERT ON "{table_name}"
+            WHEN NEW.loaded_at IS NULL
+            BEGIN
+                UPDATE "{table_name}" SET loaded_at = {self.utc_now} WHERE rowid = NEW.rowid;
+            END
+        """))
+
+    def create_staging_table(self, conn, staging_table: str, table_name: str):
+        # Temporary tables live as long as the pooled connection, so one left over by a failed load is replaced.
+        self.drop_staging_table(conn, staging_table)
+        conn.execute(text(f'CREATE TEMP TABLE "{staging_table}" AS SELECT * FROM "{table_name}" WHERE 0'))
+
+    def drop_staging_table(self, conn, staging_table: str):
+        conn.execute(text(f'DROP TABLE IF EXISTS temp."{staging_table}"'))
+
+    def in_list(self, column: str, param: str) -> str:
+        return f"{column} IN :{param}"
+
+    def prepare(self, sql: str, params: dict = None):
+        lists = [name for name, value in (params or {}).items() if isinstance(value, (list, tuple))]
+        return text(sql).bindparams(*(bindparam(name, expanding=True) for name in lists))
+
+    def create_data_version(self, conn):
+        conn.execute(text("CREATE TABLE IF NOT EXISTS DATA_VERSION (last_value BIGINT NOT NULL);"))
+        conn.execute(text(
+            "INSERT INTO data_version (last_value) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM data_version);"
+        ))
+
+    def bump_data_version(self, conn):
+        if self._has_data_version(conn):
+            conn.execute(text("UPDATE data_version SET last_value = last_value + 1"))
+
+    def read_data_version(self, conn):
+        if not self._has_data_version(conn):
+            return None
+        return conn.execute(text("SELECT last_value FROM data_version")).scalar()
+
+    def _has_data_version(self, conn) -> bool:
+        return conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND lower(name) = 'data_version'"
+        )).first() is not None
+
+DIALECTS = {dialect.name: dialect for dialect in (PostgresDialect(), SQLiteDialect())}
+
+def dialect_for(engine):
+    """
+    Look up the SQL dialect of an engine.
+
+    Args:
+        engine (sqlalchemy.engine.Engine | sqlalchemy.engine.Connection): The engine or connection.
+
+    Returns:
+        PostgresDialect: The dialect.
+
+    Raises:
+        ValueError: If the database is not supported.
+    """
+    name = engine.dialect.name
+    if name not in DIALECTS:
+        raise ValueError(f"Unsupported database '{name}'. Expected one of {list(DIALECTS)}.")
+    return DIALECTS[name]
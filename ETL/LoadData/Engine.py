@@ -0,0 +1,145 @@
+import os
+import threading
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_RECYCLE = 1800
+DEFAULT_STATEMENT_TIMEOUT = 0
+APPLICATION_NAME = "steam-etl"
+
+# Applied to every SQLite connection: write-ahead logging so queries can read while a load writes,
+# a 64 MB page cache and in-memory temporary tables for the staging tables, and enforced foreign keys.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+    'temp_store': 'MEMORY',
+    'cache_size': -65536,
+    'mmap_size': 268435456,
+    'busy_timeout': 30000,
+}
+
+_engines = {}
+_lock = threading.Lock()
+
+def database_url() -> str:
+    """
+    Build the database URL from the environment (and a .env file, if present).
+
+    DATABASE_URL is used as is when set, e.g. sqlite:///steam.db for a local database file.
+    Otherwise a PostgreSQL URL is built from the RDS_* variables.
+
+    Returns:
+        str: A SQLAlchemy URL.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if os.getenv('DATABASE_URL'):
+        return os.getenv('DATABASE_URL')
+
+    username = os.getenv('RDS_USERNAME')
+    password = os.getenv('RDS_PASSWORD')
+    host = os.getenv('RDS_HOST')
+    port = int(os.getenv('RDS_PORT', 5432))
+    database = os.getenv('RDS_DATABASE')
+    return f'postgresql+psycopg2://{username}:{password}@{host}:{port}/{database}'
+
+def get_engine(url: str = None, pool_size: int = None, max_overflow: int = None, statement_timeout: float = None):
+    """
+    Return the shared SQLAlchemy engine for a URL, creating it on first use.
+
+    Creating an engine does not connect; the first connection is opened when a query needs it.
+    Pooled connections are checked with a cheap ping before use and recycled after
+    DEFAULT_POOL_RECYCLE seconds, so connections dropped by the server are replaced transparently.
+    Engines are cached per process, so worker processes never share pooled connections with their parent.
+
+    Defaults come from RDS_POOL_SIZE, RDS_MAX_OVERFLOW and RDS_STATEMENT_TIMEOUT when set.
+
+    Args:
+        url (str, optional): SQLAlchemy URL. Defaults to database_url().
+        pool_size (int, optional): Connections kept open in the pool.
+        max_overflow (int, optional): Extra connections opened under load.
+        statement_timeout (float, optional): Seconds after which PostgreSQL cancels a statement (0 disables).
+
+    Returns:
+        sqlalchemy.engine.Engine: The engine.
+    """
+    url = url or database_url()
+    if pool_size is None:
+        pool_size = int(os.getenv('RDS_POOL_SIZE', DEFAULT_POOL_SIZE))
+    if max_overflow is None:
+        max_overflow = int(os.getenv('RDS_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW))
+    if statement_timeout is None:
+        statement_timeout = float(os.getenv('RDS_STATEMENT_TIMEOUT', DEFAULT_STATEMENT_TIMEOUT))
+
+    key = (os.getpid(), url, pool_size, max_overflow, statement_timeout)
+    with _lock:
+        engine = _engines.get(key)
+        if engine is None:
+            from sqlalchemy import create_engine
+
+            options = {}
+            if url.startswith('postgresql'):
+                options['connect_args'] = {
+                    'application_name': APPLICATION_NAME,
+                    'options': f'-c statement_timeout={int(statement_timeout * 1000)}',
+                }
+                options['pool_size'] = pool_size
+                options['max_overflow'] = max_overflow
+                options['pool_recycle'] = DEFAULT_POOL_RECYCLE
+            engine = create_engine(url, pool_pre_ping=True, **options)
+            if engine.dialect.name == 'sqlite':
+                _configure_sqlite(engine)
+            _engines[key] = engine
+    return engine
+
+def _configure_sqlite(engine):
+    """
+    Apply SQLITE_PRAGMAS to every new connection of a SQLite engine and let SQLAlchemy, rather than
+    the sqlite3 module, open transactions, so that staging DDL and loads commit or roll back together.
+
+    Transactions start with BEGIN IMMEDIATE, taking SQLite's single write lock up front. A deferred
+    transaction that reads before it writes fails with "database is locked" when another connection
+    writes in between, without waiting for busy_timeout; an immediate one waits for the lock instead,
+    so concurrent loads run one after another. Read-only transactions queue for the lock as well.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): A SQLite engine.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def on_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+def streaming(conn, chunk_size: int = 10000):
+    """
+    Switch a connection to a server-side cursor, so large results are fetched in batches
+    instead of being loaded into memory at once.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): An open connection.
+        chunk_size (int): Rows fetched from the server per round-trip.
+
+    Returns:
+        sqlalchemy.engine.Connection: The connection with streaming execution options.
+    """
+    return conn.execution_options(stream_results=True, max_row_buffer=chunk_size)
+
+def dispose_engines():
+    """
+    Close the pooled connections of every engine created by this process.
+    """
+    with _lock:
+        for (pid, *_), engine in list(_engines.items()):
+            if pid == os.getpid():
+                engine.dispose()
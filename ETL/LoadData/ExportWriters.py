@@ -0,0 +1,95 @@
+from __future__ import annotations
+import gzip
+import io
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+EXPORT_FORMATS = {
+    'parquet': '.parquet',
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+    'csv.zst': '.csv.zst',
+}
+
+class ParquetChunkWriter:
+    """
+    Append DataFrame chunks to a single Parquet file, using the schema of the first chunk.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires the 'pyarrow' package.") from e
+
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.writer = None
+
+    def write(self, df: pd.DataFrame):
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema, compression='zstd')
+        else:
+            table = table.cast(self.writer.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+class CsvChunkWriter:
+    """
+    Append DataFrame chunks to a single CSV file, optionally gzip or zstd compressed.
+    The header is written with the first chunk only.
+    """
+
+    def __init__(self, path: str, compression: str = None):
+        self.raw = None
+        if compression == 'gzip':
+            self.file = gzip.open(path, 'wt', newline='')
+        elif compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError("zstd CSV export requires the 'zstandard' package.") from e
+            self.raw = open(path, 'wb')
+            stream = zstandard.ZstdCompressor().stream_writer(self.raw)
+            self.file = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        else:
+            self.file = open(path, 'w', newline='')
+        self.header = True
+
+    def write(self, df: pd.DataFrame):
+        df.to_csv(self.file, index=False, header=self.header)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+        if self.raw is not None and not self.raw.closed:
+            self.raw.close()
+
+def open_chunk_writer(path: str, fmt: str):
+    """
+    Create a chunk writer for one of EXPORT_FORMATS.
+
+    Args:
+        path (str): The output file path.
+        fmt (str): 'parquet', 'csv', 'csv.gz' or 'csv.zst'.
+
+    Returns:
+        ParquetChunkWriter | CsvChunkWriter: A writer with write(df) and close() methods.
+    """
+    if fmt == 'parquet':
+        return ParquetChunkWriter(path)
+    if fmt == 'csv.gz':
+        return CsvChunkWriter(path, 'gzip')
+    if fmt == 'csv.zst':
+        return CsvChunkWriter(path, 'zstd')
+    if fmt == 'csv':
+        return CsvChunkWriter(path)
+    raise ValueError(f"Unknown export format '{fmt}'. Expected one of {list(EXPORT_FORMATS)}.")
@@ -1,116 +1,821 @@
+import io
 import os
+from datetime import datetime, timedelta, timezone
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, inspect, text
-from dotenv import load_dotenv
+from sqlalchemy import Boolean, DateTime, Float, Integer, Numeric, bindparam, inspect, text
+from sqlalchemy.exc import DBAPIError
+from LoadData.Dialects import dialect_for
+from LoadData.Engine import database_url, get_engine, streaming
+from LoadData.ExportWriters import EXPORT_FORMATS, open_chunk_writer
+from LoadData.UserCache import DEFAULT_USER_CACHE_SIZE, UserCache
+from Monitoring.RunMetrics import metrics
 
 
+LOAD_METHODS = ('to_sql', 'copy')
+CONFLICT_ACTIONS = ('nothing', 'update')
+LAST_EXPORT_MARKER = ".last_export"
+LOAD_TIME_COLUMN = 'loaded_at'
+LOAD_TIME_TABLES = ('users', 'games', 'reviews')
+# How far the next --since last export reaches back before the previous export started, so rows committed
+# by loads that were still running when it started (and were stamped before it) are not missed.
+EXPORT_OVERLAP = timedelta(minutes=10)
+USER_STAT_COLUMNS = ['steamid', 'num_games_owned', 'num_reviews']
+# SQLSTATEs of a CREATE TABLE that lost a race with another session creating the same table.
+PARTITION_EXISTS_ERRORS = ('42P07', '23505')
+
+# Primary key and insert-or-update policy used by append_table for each table.
+UPSERT_POLICIES = {
+    'users': {'key_columns': ['steamid'], 'on_conflict': 'update'},
+    'games': {'key_columns': ['appid'], 'on_conflict': 'update'},
+    'reviews': {'key_columns': ['recommendationid'], 'on_conflict': 'update'},
+}
+
 class Database:
-    def __init__(self):
+    def __init__(self, load_method: str = 'to_sql', chunk_size: int = 10000, upsert_policies: dict = None,
+                 url: str = None, user_cache_size: int = DEFAULT_USER_CACHE_SIZE):
         """
         Initialize the Database class by loading environment variables and setting connection parameters.
+
+        Args:
+            load_method (str): How DataFrames are written: 'to_sql' (batched INSERTs) or 'copy' (COPY FROM STDIN,
+                PostgreSQL only).
+            chunk_size (int): Number of rows sent to the database per batch.
+            upsert_policies (dict, optional): Per-table overrides of UPSERT_POLICIES.
+            url (str, optional): SQLAlchemy URL overriding DATABASE_URL and the RDS_* connection settings.
+            user_cache_size (int): Number of users whose stored stats upsert_users() keeps in memory (0 disables).
         """
-        load_dotenv()
+        if load_method not in LOAD_METHODS:
+            raise ValueError(f"Unknown load method '{load_method}'. Expected one of {LOAD_METHODS}.")
+        self.load_method = load_method
+        self.chunk_size = chunk_size
+        self.upsert_policies = {**UPSERT_POLICIES, **(upsert_policies or {})}
+        self.partition_columns = {}
+        self.known_partitions = set()
+        self.user_cache = UserCache(user_cache_size) if user_cache_size else None
 
-        self.username = os.getenv('RDS_USERNAME')
-        self.password = os.getenv('RDS_PASSWORD')
-        self.host = os.getenv('RDS_HOST')
-        self.port = int(os.getenv('RDS_PORT', 5432))
+        self.url = url or database_url()
         self.database = os.getenv('RDS_DATABASE')
 
         self.engine = None
+        self.dialect = None
 
     def connect(self) -> bool:
         """
-        Establish a connection to the PostgreSQL database using SQLAlchemy.
+        Attach the shared, pooled SQLAlchemy engine for the database.
+
+        No connection is opened here; the pool connects on the first query and pings pooled
+        connections before reuse, so a run that does no database work never touches the server.
+        The 'copy' load method falls back to 'to_sql' on databases without COPY.
 
         Returns:
-            bool: True if connection is successful, False otherwise.
+            bool: True if the engine could be created, False otherwise.
         """
         try:
-            url = f'postgresql+psycopg2://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}'
-            self.engine = create_engine(url)
-
-            with self.engine.connect() as connection:
-                connection.execute(text("SELECT 1"))
-
-            print("Connection to RDS successful.")
-            return True
-
+            self.engine = get_engine(self.url)
+            self.dialect = dialect_for(self.engine)
         except Exception as e:
-            print(f"Failed to connect to RDS: {e}")
+            print(f"Failed to set up the database engine: {e}")
             self.engine = None
             return False
 
-    def replace_table(self, df: pd.DataFrame, table_name: str):
+        if self.load_method == 'copy' and not self.dialect.supports_copy:
+            print(f"COPY is not available on {self.dialect.name}; loading with batched INSERTs instead.")
+            self.load_method = 'to_sql'
+        return True
+
+    def replace_table(self, df, table_name: str):
         """
         Replace all records in a database table with new data from a DataFrame.
 
         Args:
-            df (pd.DataFrame): The new data to insert.
+            df (pd.DataFrame | iterable): The new data to insert, or an iterable of DataFrame batches.
             table_name (str): The name of the table to replace.
         """
         if self.engine is None:
             print("Engine not initialized. Call connect() first.")
             return
 
+        batches = [df] if isinstance(df, pd.DataFrame) else df
         inspector = inspect(self.engine)
-        if inspector.has_table(table_name):
-            with self.engine.connect() as conn:
+        with self.engine.connect() as conn:
+            if inspector.has_table(table_name):
                 conn.execute(text(f'DELETE FROM "{table_name}"'))
-                conn.commit()
-
-        df.to_sql(name=table_name, con=self.engine, if_exists='append', index=False)
+            for batch in batches:
+                self._write_frame(conn, batch, table_name)
+            conn.commit()
+            self._bump_data_version(conn)
         print(f"Replaced data in table '{table_name}'.")
 
-    def append_table(self, df: pd.DataFrame, table_name: str, pk_column: str = 'steamid'):
+    def append_table(self, df: pd.DataFrame, table_name: str, pk_column: str = None, on_conflict: str = None):
         """
-        Append new records to a table, skipping rows that already exist based on a primary key column.
+        Upsert records into a table. Rows are staged in a temporary table and merged inside the
+        database with INSERT ... ON CONFLICT on the table's primary key.
 
         Args:
             df (pd.DataFrame): The data to insert.
             table_name (str): The name of the target table.
-            pk_column (str): The column used to identify existing records (default: 'steamid').
+            pk_column (str, optional): Conflict column overriding the table's configured key.
+            on_conflict (str, optional): 'nothing' to keep existing rows or 'update' to overwrite them.
+                Defaults to the table's configured policy.
         """
         if self.engine is None:
             print("Engine not initialized. Call connect() first.")
             return
-        
-        existing_ids = pd.read_sql(f'SELECT {pk_column} FROM "{table_name}"', self.engine)[pk_column].astype(str).tolist()
-        df[pk_column] = df[pk_column].astype(str)
-        
-        df_filtered = df[~df[pk_column].isin(existing_ids)]
-        
-        if df_filtered.empty:
+
+        policy = self.upsert_policies.get(table_name.lower(), {})
+        key_columns = [pk_column] if pk_column else policy.get('key_columns')
+        on_conflict = on_conflict or policy.get('on_conflict', 'nothing')
+        if not key_columns:
+            raise ValueError(f"No primary key configured for table '{table_name}'.")
+        if on_conflict not in CONFLICT_ACTIONS:
+            raise ValueError(f"Unknown conflict action '{on_conflict}'. Expected one of {CONFLICT_ACTIONS}.")
+
+        if not inspect(self.engine).has_table(table_name):
+            print(f"Table '{table_name}' does not exist. Create the schema first.")
+            return
+
+        partition_column = self._partition_column(table_name)
+        if partition_column and partition_column not in key_columns:
+            key_columns = key_columns + [partition_column]
+
+        df = df.drop_duplicates(subset=key_columns, keep='last')
+        if df.empty:
             print(f"No new rows to insert into '{table_name}'.")
             return
-        
-        df_filtered.to_sql(name=table_name, con=self.engine, if_exists='append', index=False)
-        print(f"Appended {len(df_filtered)} new rows to table '{table_name}'.")
 
-    def export_tables_to_csv(self, output_dir=None):
+        if partition_column:
+            targets = self._route_to_partitions(df, table_name, partition_column)
+        else:
+            targets = [(table_name, df)]
+        if not targets:
+            print(f"No new rows to insert into '{table_name}'.")
+            return
+
+        with self.engine.connect() as conn:
+            stamp_load_time = table_name.lower() in LOAD_TIME_TABLES
+            upserted = 0
+            for target_table, batch in targets:
+                upserted += self._upsert_frame(conn, batch, target_table, key_columns, on_conflict, stamp_load_time)
+            conn.commit()
+            self._bump_data_version(conn)
+        print(f"Upserted {upserted} rows into table '{table_name}'.")
+
+    def drop_unchanged_rows(self, df: pd.DataFrame, table_name: str = "reviews", key_column: str = 'recommendationid',
+                            hash_column: str = 'content_hash') -> pd.DataFrame:
         """
-        Export predefined database tables (GAMES, REVIEWS, USERS) to CSV files.
+        Remove rows whose content hash matches the row already stored under the same key.
+
+        Only the keys of the given batch are looked up, so the cost is proportional to the batch size.
 
         Args:
-            output_dir (str, optional): The directory to save CSV files. If not provided, exports to Desktop.
+            df (pd.DataFrame): The batch to load, with `key_column` and `hash_column`.
+            table_name (str): The table holding the stored hashes.
+            key_column (str): The column identifying a row.
+            hash_column (str): The column holding the content hash.
+
+        Returns:
+            pd.DataFrame: The new and changed rows.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return df
+        if df.empty:
+            return df
+
+        with metrics.stage("load.diff", rows_in=len(df)) as stage:
+            with self.engine.connect() as conn:
+                key_filter = self.dialect.in_list(f'"{key_column}"', 'keys')
+                params = {"keys": df[key_column].astype('int64').tolist()}
+                stored = pd.read_sql(
+                    self.dialect.prepare(
+                        f'SELECT "{key_column}", "{hash_column}" FROM "{table_name}" '
+                        f'WHERE {key_filter} AND "{hash_column}" IS NOT NULL',
+                        params
+                    ),
+                    conn,
+                    params=params
+                )
+            stored = stored.drop_duplicates(subset=[key_column])
+            positions = pd.Index(stored[key_column].to_numpy()).get_indexer(df[key_column].to_numpy())
+            stored_hashes = np.append(stored[hash_column].to_numpy(dtype=np.int64), np.int64(0))
+            unchanged = (positions >= 0) & (stored_hashes[positions] == df[hash_column].to_numpy())
+            changed_df = df[~unchanged]
+            stage.rows_out = len(changed_df)
+
+        metrics.add("load.diff", rows_skipped=len(df) - len(changed_df))
+        return changed_df
+
+    def upsert_users(self, users_df: pd.DataFrame, table_name: str = "users") -> int:
+        """
+        Upsert only new users and users whose num_games_owned or num_reviews changed.
+
+        Stored stats are taken from the user cache, and for users not cached from the table in one query
+        per batch. Rows written are remembered in the cache once committed. Without a cache every row is upserted.
+
+        Args:
+            users_df (pd.DataFrame): Users with USER_STAT_COLUMNS, one row per steamid.
+            table_name (str): The users table (default: 'users').
+
+        Returns:
+            int: Number of users written.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return 0
+        if users_df.empty:
+            return 0
+        if self.user_cache is None:
+            self.append_table(users_df, table_name)
+            return len(users_df)
+
+        with metrics.stage("load.users", rows_in=len(users_df)) as stage:
+            rows = [
+                (int(steamid), int(num_games_owned), int(num_reviews))
+                for steamid, num_games_owned, num_reviews
+                in users_df[USER_STAT_COLUMNS].itertuples(index=False, name=None)
+            ]
+            known, missing = self.user_cache.get_many(steamid for steamid, *_ in rows)
+            if missing:
+                stored = self._read_user_stats(missing, table_name)
+                self.user_cache.put_many(stored)
+                known.update((steamid, tuple(stats)) for steamid, *stats in stored)
+
+            changed = np.array([known.get(steamid) != tuple(stats) for steamid, *stats in rows], dtype=bool)
+            changed_df = users_df[changed]
+            stage.rows_out = len(changed_df)
+
+        metrics.add("load.users", rows_skipped=len(users_df) - len(changed_df))
+        if not changed_df.empty:
+            self.append_table(changed_df, table_name)
+            self.user_cache.put_many(row for row, is_changed in zip(rows, changed) if is_changed)
+        return len(changed_df)
+
+    def _read_user_stats(self, steamids: list, table_name: str) -> list:
+        """
+        Read the stored stats of the given users.
+
+        Args:
+            steamids (list): Steam IDs as ints.
+            table_name (str): The users table.
+
+        Returns:
+            list: (steamid, num_games_owned, num_reviews) tuples of the users found.
+        """
+        params = {"steamids": steamids}
+        with self.engine.connect() as conn:
+            result = conn.execute(self.dialect.prepare(
+                f'SELECT steamid, num_games_owned, num_reviews FROM "{table_name}" '
+                f'WHERE {self.dialect.in_list("steamid", "steamids")}',
+                params
+            ), params)
+            return [(int(steamid), int(num_games_owned), int(num_reviews))
+                    for steamid, num_games_owned, num_reviews in result]
+
+    def _upsert_frame(self, conn, df: pd.DataFrame, table_name: str, key_columns: list, on_conflict: str,
+                      stamp_load_time: bool = False) -> int:
+        """
+        Stage a DataFrame in a temporary table and merge it into `table_name` with INSERT ... ON CONFLICT.
+
+        Args:
+            conn (sqlalchemy.engine.Connection): The connection to write on. The caller commits.
+            df (pd.DataFrame): The data to insert, without duplicate keys.
+            table_name (str): The table or partition to merge into.
+            key_columns (list): The conflict columns.
+            on_conflict (str): 'nothing' or 'update'.
+            stamp_load_time (bool): Set LOAD_TIME_COLUMN of updated rows to the current time.
+                Inserted rows get it from the column default.
+
+        Returns:
+            int: Number of rows inserted or updated.
+        """
+        df = df.drop(columns=[LOAD_TIME_COLUMN], errors='ignore')
+        staging_table = f"{table_name}_staging"
+        columns = ", ".join(f'"{column}"' for column in df.columns)
+        conflict_columns = ", ".join(f'"{column}"' for column in key_columns)
+        update_columns = [column for column in df.columns if column not in key_columns]
+
+        if on_conflict == 'update' and update_columns:
+            assignments = ", ".join(f'"{column}" = EXCLUDED."{column}"' for column in update_columns)
+            if stamp_load_time:
+                assignments += f', "{LOAD_TIME_COLUMN}" = {self.dialect.utc_now}'
+            conflict_clause = f"ON CONFLICT ({conflict_columns}) DO UPDATE SET {assignments}"
+        else:
+            conflict_clause = f"ON CONFLICT ({conflict_columns}) DO NOTHING"
+
+        self.dialect.create_staging_table(conn, staging_table, table_name)
+        self._write_frame(conn, df, staging_table)
+        with metrics.stage("load.merge", rows_in=len(df)) as stage:
+            result = conn.execute(text(
+                f'INSERT INTO "{table_name}" ({columns}) SELECT {columns} FROM "{staging_table}" WHERE true '
+                f'{conflict_clause}'
+            ))
+            stage.rows_out = result.rowcount
+        self.dialect.drop_staging_table(conn, staging_table)
+        return result.rowcount
+
+    def _partition_column(self, table_name: str) -> str:
+        """
+        Look up the range partition column of a table, caching the answer.
+
+        Args:
+            table_name (str): The table to check.
+
+        Returns:
+            str: The partition column, or None if the table is not partitioned.
+        """
+        if not self.dialect.supports_partitions:
+            return None
+        if table_name not in self.partition_columns:
+            with self.engine.connect() as conn:
+                self.partition_columns[table_name] = conn.execute(text("""
+                    SELECT a.attname
+                    FROM pg_partitioned_table p
+                    JOIN pg_class c ON c.oid = p.partrelid
+                    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = p.partattrs[0]
+                    WHERE c.relname = :table_name AND pg_table_is_visible(c.oid)
+                """), {"table_name": table_name}).scalar()
+        return self.partition_columns[table_name]
+
+    def _route_to_partitions(self, df: pd.DataFrame, table_name: str, partition_column: str) -> list:
+        """
+        Split a batch by month of the partition column, creating missing monthly partitions.
+
+        The partition column is part of the partitioned table's primary key and cannot be NULL, so rows
+        without a timestamp are dropped with a warning instead of failing the whole batch.
+
+        Args:
+            df (pd.DataFrame): The batch to route.
+            table_name (str): The partitioned parent table.
+            partition_column (str): The timestamp column the table is partitioned by.
+
+        Returns:
+            list: (partition name, rows) pairs.
+        """
+        months = pd.to_datetime(df[partition_column]).dt.to_period('M')
+        undated = months.isna()
+        if undated.any():
+            print(f"Warning: skipped {int(undated.sum())} rows without {partition_column} "
+                  f"for partitioned table '{table_name}'.")
+            metrics.add("load.partitions", rows_skipped=int(undated.sum()))
+
+        targets = []
+        for month, batch in df[~undated].groupby(months[~undated]):
+            targets.append((self._ensure_partition(table_name, month), batch))
+        return targets
+
+    def _ensure_partition(self, table_name: str, month: pd.Period) -> str:
+        """
+        Create the monthly partition of a table if it does not exist yet.
+
+        The partition is created and committed on its own connection before the load starts, so the
+        lock it takes on the parent table is held only briefly and not for the whole load. If a concurrent
+        loader creates the same partition first, its partition is used.
+
+        Args:
+            table_name (str): The partitioned parent table.
+            month (pd.Period): The month the partition covers.
+
+        Returns:
+            str: The partition name.
+        """
+        partition = f"{table_name}_p{month.strftime('%Y%m')}"
+        if partition not in self.known_partitions:
+            start = month.start_time.strftime('%Y-%m-%d')
+            end = (month + 1).start_time.strftime('%Y-%m-%d')
+            try:
+                with self.engine.connect() as conn:
+                    conn.execute(text(
+                        f'CREATE TABLE IF NOT EXISTS "{partition}" PARTITION OF "{table_name}" '
+                        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                    ))
+                    conn.commit()
+            except DBAPIError as e:
+                # IF NOT EXISTS does not cover a concurrent CREATE, which fails with duplicate_table
+                # or a unique violation in the catalog once the other transaction commits.
+                if getattr(e.orig, 'pgcode', None) not in PARTITION_EXISTS_ERRORS:
+                    raise
+            self.known_partitions.add(partition)
+        return partition
+
+    def detach_partitions(self, table_name: str, before: str) -> list:
+        """
+        Detach the monthly partitions of a table that end on or before a month, so they can be archived or dropped.
+
+        Args:
+            table_name (str): The partitioned parent table.
+            before (str): First month to keep, as 'YYYY-MM'.
+
+        Returns:
+            list: Names of the detached partitions.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return []
+        if not self.dialect.supports_partitions:
+            print(f"Table '{table_name}' has no partitions on {self.dialect.name}.")
+            return []
+
+        cutoff = pd.Period(before, freq='M').strftime('%Y%m')
+        prefix = f"{table_name}_p"
+        with self.engine.connect() as conn:
+            partitions = [row[0] for row in conn.execute(text("""
+                SELECT child.relname
+                FROM pg_inherits i
+                JOIN pg_class parent ON parent.oid = i.inhparent
+                JOIN pg_class child ON child.oid = i.inhrelid
+                WHERE parent.relname = :table_name AND pg_table_is_visible(parent.oid)
+            """), {"table_name": table_name})]
+            detached = sorted(
+                partition for partition in partitions
+                if partition.startswith(prefix) and partition[len(prefix):].isdigit() and partition[len(prefix):] < cutoff
+            )
+            for partition in detached:
+                conn.execute(text(f'ALTER TABLE "{table_name}" DETACH PARTITION "{partition}"'))
+                self.known_partitions.discard(partition)
+            conn.commit()
+            self._bump_data_version(conn)
+
+        print(f"Detached {len(detached)} partitions of '{table_name}' before {before}.")
+        return detached
+
+
+    def refresh_games(self, games, table_name: str = "games") -> dict:
+        """
+        Apply only the differences between a fresh Steam app list and the games table, in one transaction.
+
+        New App IDs are inserted, App IDs whose name changed are updated and App IDs missing from
+        the app list are deleted. An empty app list is rejected so a failed fetch cannot wipe the table.
+
+        Args:
+            games (pd.DataFrame | iterable): The app list with 'appid' and 'name' columns, or an iterable of such batches.
+            table_name (str): The name of the games table (default: 'games').
+
+        Returns:
+            dict: Counts of 'inserted', 'renamed' and 'removed' games, or None if nothing was applied.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return None
+
+        batches = [games] if isinstance(games, pd.DataFrame) else games
+        staging_table = f"{table_name}_staging"
+        latest_games = f'SELECT appid, MAX(name) AS name FROM "{staging_table}" GROUP BY appid'
+
+        with self.engine.connect() as conn:
+            self.dialect.create_staging_table(conn, staging_table, table_name)
+            staged = 0
+            for batch in batches:
+                batch = batch[['appid', 'name']].drop_duplicates(subset=['appid'], keep='last')
+                self._write_frame(conn, batch, staging_table)
+                staged += len(batch)
+
+            if staged == 0:
+                conn.rollback()
+                print(f"Refusing to refresh '{table_name}' from an empty app list.")
+                return None
+
+            conn.execute(text(f'ANALYZE "{staging_table}"'))
+
+            with metrics.stage("load.merge", rows_in=staged) as stage:
+                renamed = conn.execute(text(f"""
+                    UPDATE "{table_name}" AS g SET name = s.name, {LOAD_TIME_COLUMN} = {self.dialect.utc_now}
+                    FROM ({latest_games}) AS s
+                    WHERE g.appid = s.appid AND g.name IS DISTINCT FROM s.name
+                """)).rowcount
+                inserted = conn.execute(text(f"""
+                    INSERT INTO "{table_name}" (appid, name) {latest_games}
+                    ON CONFLICT (appid) DO NOTHING
+                """)).rowcount
+                removed = conn.execute(text(f"""
+                    DELETE FROM "{table_name}" AS g
+                    WHERE NOT EXISTS (SELECT 1 FROM "{staging_table}" AS s WHERE s.appid = g.appid)
+                """)).rowcount
+                self.dialect.drop_staging_table(conn, staging_table)
+                conn.commit()
+                self._bump_data_version(conn)
+                stage.rows_out = inserted + renamed + removed
+
+        counts = {'inserted': inserted, 'renamed': renamed, 'removed': removed}
+        print(f"Refreshed table '{table_name}': {inserted} inserted, {renamed} renamed, {removed} removed.")
+        return counts
+
+    def _bump_data_version(self, conn):
+        """
+        Advance the DATA_VERSION counter after a committed load, so query results cached before
+        the load are no longer served. Does nothing if the schema has no DATA_VERSION counter.
+
+        Args:
+            conn (sqlalchemy.engine.Connection): The connection the load was committed on.
+        """
+        self.dialect.bump_data_version(conn)
+        conn.commit()
+
+    def _write_frame(self, conn, df: pd.DataFrame, table_name: str):
+        """
+        Write a DataFrame to a table on an open connection using the configured load method.
+
+        Args:
+            conn (sqlalchemy.engine.Connection): The connection to write on. The caller commits.
+            df (pd.DataFrame): The data to insert.
+            table_name (str): The name of the target table.
+        """
+        with metrics.stage("load.write", rows_in=len(df)) as stage:
+            if self.load_method == 'copy':
+                self._copy_frame(conn, df, table_name)
+            else:
+                df.to_sql(name=table_name, con=conn, if_exists='append', index=False, chunksize=self.chunk_size)
+            stage.rows_out = len(df)
+
+    def _copy_frame(self, conn, df: pd.DataFrame, table_name: str):
+        """
+        Stream a DataFrame into a table with COPY FROM STDIN, one in-memory CSV buffer per chunk.
+
+        Args:
+            conn (sqlalchemy.engine.Connection): The connection to write on. The caller commits.
+            df (pd.DataFrame): The data to insert.
+            table_name (str): The name of the target table.
+        """
+        if not inspect(conn).has_table(table_name):
+            df.head(0).to_sql(name=table_name, con=conn, if_exists='append', index=False)
+
+        columns = ", ".join(f'"{column}"' for column in df.columns)
+        copy_sql = f'COPY "{table_name}" ({columns}) FROM STDIN WITH (FORMAT csv)'
+
+        with conn.connection.dbapi_connection.cursor() as cursor:
+            for start in range(0, len(df), self.chunk_size):
+                buffer = io.StringIO()
+                df.iloc[start:start + self.chunk_size].to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+
+    def get_game_ids(self, table_name: str = "games") -> list:
+        """
+        Fetch every App ID stored in the games table.
+
+        Args:
+            table_name (str): The name of the games table (default: 'games').
+
+        Returns:
+            list: App IDs as ints, or an empty list if the engine is not initialized.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return []
+
+        with self.engine.connect() as conn:
+            result = conn.execute(text(f'SELECT appid FROM "{table_name}" ORDER BY appid'))
+            return [int(row[0]) for row in result]
+
+    def refresh_review_stats(self, appids: list = None, steamids: list = None):
+        """
+        Recompute the per-game and per-user review summaries used by the dashboard queries.
+
+        Only the given games and users are recomputed, so the cost follows the size of the load.
+        Passing neither rebuilds both summary tables from scratch.
+
+        Args:
+            appids (list, optional): App IDs whose GAME_REVIEW_STATS rows are refreshed.
+            steamids (list, optional): Steam IDs whose USER_REVIEW_STATS rows are refreshed.
         """
         if self.engine is None:
             print("Engine not initialized. Call connect() first.")
             return
 
+        full_refresh = appids is None and steamids is None
+
+        with metrics.stage("load.analytics"), self.engine.connect() as conn:
+            if full_refresh or appids:
+                params = {} if full_refresh else {"appids": [int(appid) for appid in appids]}
+                self._refresh_summary(conn, "game_review_stats", "appid", """
+                    SELECT appid, COUNT(*), SUM(playtime_forever), AVG(playtime_forever),
+                           SUM(votes_up), SUM(votes_funny), CURRENT_TIMESTAMP
+                    FROM reviews
+                    {filter}
+                    GROUP BY appid
+                """, ['review_count', 'total_playtime', 'avg_playtime', 'total_votes_up', 'total_votes_funny',
+                      'refreshed_at'], params, "appids")
+
+            if full_refresh or steamids:
+                params = {} if full_refresh else {"steamids": [int(steamid) for steamid in steamids]}
+                self._refresh_summary(conn, "user_review_stats", "steamid", """
+                    SELECT steamid, COUNT(*), SUM(playtime_forever), CURRENT_TIMESTAMP
+                    FROM reviews
+                    {filter}
+                    GROUP BY steamid
+                """, ['review_count', 'total_playtime', 'refreshed_at'], params, "steamids")
+
+            conn.commit()
+            self._bump_data_version(conn)
+
+    def _refresh_summary(self, conn, table_name: str, key_column: str, select_sql: str, value_columns: list,
+                         params: dict, list_param: str):
+        """
+        Upsert recomputed summary rows and delete the rows of keys that no longer have reviews.
+
+        Rows are merged with INSERT ... ON CONFLICT rather than deleted and reinserted, so concurrent
+        loads refreshing the same game or user do not collide on the summary table's primary key.
+
+        Args:
+            conn (sqlalchemy.engine.Connection): The connection to write on. The caller commits.
+            table_name (str): The summary table.
+            key_column (str): The summary table's primary key, also a column of REVIEWS.
+            select_sql (str): SELECT producing the key followed by `value_columns`, with a {filter} placeholder.
+            value_columns (list): The summary columns after the key.
+            params (dict): The keys to refresh under `list_param`, or empty for every key.
+            list_param (str): Name of the parameter holding the keys.
+        """
+        key_filter = self.dialect.in_list(key_column, list_param) if params else None
+        columns = ", ".join([key_column, *value_columns])
+        assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in value_columns)
+
+        conn.execute(self.dialect.prepare(f"""
+            DELETE FROM {table_name}
+            WHERE {f"{key_filter} AND " if key_filter else ""}NOT EXISTS (
+                SELECT 1 FROM reviews WHERE reviews.{key_column} = {table_name}.{key_column}
+            )
+        """, params), params)
+        conn.execute(self.dialect.prepare(f"""
+            INSERT INTO {table_name} ({columns})
+            {select_sql.format(filter=f"WHERE {key_filter}" if key_filter else "")}
+            ON CONFLICT ({key_column}) DO UPDATE SET {assignments}
+        """, params), params)
+
+    def get_sync_state(self, appid: int) -> dict:
+        """
+        Read the incremental sync checkpoint of a game.
+
+        Args:
+            appid (int): Steam App ID of the game.
+
+        Returns:
+            dict: The checkpoint row ('last_timestamp_updated', 'last_cursor', 'last_synced_at'),
+                or None if the game has never been synced.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return None
+
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT last_timestamp_updated, last_cursor, last_synced_at FROM sync_state WHERE appid = :appid"),
+                {"appid": int(appid)}
+            ).mappings().first()
+        return dict(row) if row else None
+
+    def get_newest_review_timestamp(self, appid: int) -> int:
+        """
+        Find the newest `timestamp_updated` among the stored reviews of a game.
+
+        Args:
+            appid (int): Steam App ID of the game.
+
+        Returns:
+            int: Unix time of the most recently updated review, or None if the game has no reviews.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return None
+
+        with self.engine.connect() as conn:
+            newest = conn.execute(
+                text("SELECT MAX(timestamp_updated) FROM reviews WHERE appid = :appid"),
+                {"appid": int(appid)}
+            ).scalar()
+        return None if newest is None else int(pd.Timestamp(newest).timestamp())
+
+    def save_sync_state(self, appid: int, last_timestamp_updated: int, last_cursor: str = None):
+        """
+        Store the incremental sync checkpoint of a game.
+
+        Args:
+            appid (int): Steam App ID of the game.
+            last_timestamp_updated (int): Unix time of the newest review ingested.
+            last_cursor (str, optional): Cursor the next sync continues from, if this one was cut short.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return
+
+        with self.engine.connect() as conn:
+            conn.execute(text("""
+                INSERT INTO sync_state (appid, last_timestamp_updated, last_cursor, last_synced_at)
+                VALUES (:appid, :last_timestamp_updated, :last_cursor, CURRENT_TIMESTAMP)
+                ON CONFLICT (appid) DO UPDATE SET
+                    last_timestamp_updated = EXCLUDED.last_timestamp_updated,
+                    last_cursor = EXCLUDED.last_cursor,
+                    last_synced_at = EXCLUDED.last_synced_at
+            """), {
+                "appid": int(appid),
+                "last_timestamp_updated": int(last_timestamp_updated),
+                "last_cursor": last_cursor,
+            })
+            conn.commit()
+
+    def _export_dtypes(self, table_name: str) -> dict:
+        """
+        Map the columns of a table to pandas dtypes so every exported chunk has the same schema.
+
+        Args:
+            table_name (str): The table to inspect.
+
+        Returns:
+            dict: Column name to pandas dtype.
+        """
+        dtypes = {}
+        for column in inspect(self.engine).get_columns(table_name):
+            column_type = column['type']
+            if isinstance(column_type, Boolean):
+                dtypes[column['name']] = 'boolean'
+            elif isinstance(column_type, Integer):
+                dtypes[column['name']] = 'Int64'
+            elif isinstance(column_type, (Numeric, Float)):
+                dtypes[column['name']] = 'float64'
+            elif isinstance(column_type, DateTime):
+                dtypes[column['name']] = 'datetime64[ns]'
+            else:
+                dtypes[column['name']] = 'string'
+        return dtypes
+
+    def export_tables(self, output_dir: str = None, fmt: str = 'parquet', chunk_size: int = 50000, since=None) -> dict:
+        """
+        Stream the USERS, REVIEWS and GAMES tables to files in chunks through a server-side cursor.
+
+        When `since` is given only rows inserted or changed by a load at or after it are exported,
+        judged by each table's LOAD_TIME_COLUMN. The database's UTC time at the start of every successful
+        export is recorded in the output directory, so `since='last'` exports what was loaded since the
+        previous export (reaching back EXPORT_OVERLAP further to catch loads that were still committing).
+
+        Args:
+            output_dir (str, optional): The directory to save files. If not provided, exports to Desktop.
+            fmt (str): 'parquet', 'csv', 'csv.gz' or 'csv.zst'.
+            chunk_size (int): Number of rows fetched and written per chunk.
+            since (datetime | str, optional): Only export rows loaded at or after this UTC time,
+                or 'last' for the start of the previous export.
+
+        Returns:
+            dict: Number of exported rows per table.
+        """
+        if self.engine is None:
+            print("Engine not initialized. Call connect() first.")
+            return {}
+
         if output_dir is None:
             desktop = os.path.join(os.path.expanduser("~"), "Desktop")
             output_dir = os.path.join(desktop, self.database or "rds_export")
 
         os.makedirs(output_dir, exist_ok=True)
 
-        table_names = ["USERS", "REVIEWS", "GAMES"]
+        marker_path = os.path.join(output_dir, LAST_EXPORT_MARKER)
+        with self.engine.connect() as conn:
+            started_at = pd.Timestamp(conn.execute(text(f"SELECT {self.dialect.utc_now}")).scalar()).to_pydatetime()
+        if since == 'last':
+            since = None
+            if os.path.exists(marker_path):
+                with open(marker_path) as f:
+                    since = datetime.fromisoformat(f.read().strip()) - EXPORT_OVERLAP
+        if since is not None and since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+        params = {}
+        suffix = ""
+        where = ""
+        if since is not None:
+            params = {"since": since}
+            suffix = f"_since_{since:%Y%m%dT%H%M%S}"
+            where = f" WHERE {LOAD_TIME_COLUMN} >= :since"
+        queries = {table: f"SELECT * FROM {table}{where}" for table in ("users", "reviews", "games")}
 
+        row_counts = {}
         try:
-            for table in table_names:
-                df = pd.read_sql_table(table, self.engine)
-                output_path = os.path.join(output_dir, f"{table}.csv")
-                df.to_csv(output_path, index=False)
-                print(f"Exported {table} to {output_path}")
+            for table, query in queries.items():
+                output_path = os.path.join(output_dir, f"{table.upper()}{suffix}{EXPORT_FORMATS[fmt]}")
+                dtypes = self._export_dtypes(table)
+                writer = open_chunk_writer(output_path, fmt)
+                row_counts[table] = 0
+                try:
+                    with self.engine.connect() as conn:
+                        conn = streaming(conn, chunk_size)
+                        statement = text(query).bindparams(bindparam("since", type_=DateTime())) if params else text(query)
+                        for chunk in pd.read_sql(statement, conn, params=params, chunksize=chunk_size, dtype=dtypes):
+                            writer.write(chunk)
+                            row_counts[table] += len(chunk)
+                finally:
+                    writer.close()
+                print(f"Exported {row_counts[table]} rows of {table.upper()} to {output_path}")
         except Exception as e:
             print(f"Failed to export tables: {e}")
+            return row_counts
+
+        with open(marker_path, "w") as f:
+            f.write(started_at.isoformat())
+        return row_counts
+
+    def export_tables_to_csv(self, output_dir=None):
+        """
+        Export predefined database tables (GAMES, REVIEWS, USERS) to CSV files.
+
+        Args:
+            output_dir (str, optional): The directory to save CSV files. If not provided, exports to Desktop.
+        """
+        self.export_tables(output_dir, fmt='csv')
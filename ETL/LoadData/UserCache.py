@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_USER_CACHE_SIZE = 200_000
+
+class UserCache:
+    """
+    In-memory LRU map of steamid to the (num_games_owned, num_reviews) stored in USERS.
+
+    Entries are only added for rows read from or committed to the database, so a cached value is
+    what USERS held when this process last touched the user. Safe to share between threads.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_USER_CACHE_SIZE):
+        """
+        Args:
+            max_size (int): Maximum number of users kept; the least recently used are evicted first.
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, steamids) -> tuple:
+        """
+        Look up several users and mark the cached ones as recently used.
+
+        Args:
+            steamids (iterable): Steam IDs as ints.
+
+        Returns:
+            tuple: (dict of steamid to cached stats, list of Steam IDs not in the cache)
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for steamid in steamids:
+                stats = self._entries.get(steamid)
+                if stats is None:
+                    missing.append(steamid)
+                else:
+                    self._entries.move_to_end(steamid)
+                    found[steamid] = stats
+        return found, missing
+
+    def put_many(self, rows):
+        """
+        Store the stats of several users, evicting the least recently used beyond max_size.
+
+        Args:
+            rows (iterable): (steamid, num_games_owned, num_reviews) tuples of ints.
+        """
+        with self._lock:
+            for steamid, num_games_owned, num_reviews in rows:
+                self._entries[steamid] = (num_games_owned, num_reviews)
+                self._entries.move_to_end(steamid)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Forget every cached user.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+class StageTimer:
+    """
+    Handle yielded by RunMetrics.stage, used to report the rows a stage produced.
+    """
+
+    def __init__(self, rows_in: int = None):
+        self.rows_in = rows_in
+        self.rows_out = None
+
+class RunMetrics:
+    """
+    Thread-safe collector of per-stage timings and counters for one ETL run.
+
+    Each stage accumulates its number of calls, wall time, rows in and rows out, plus any
+    named counters such as bytes downloaded, retries or sleep time.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Discard everything recorded so far and restart the run clock.
+        """
+        with self.lock:
+            self.stages = {}
+            self.started_at = datetime.now(timezone.utc)
+            self.started_clock = time.perf_counter()
+
+    def _stage(self, name: str) -> dict:
+        return self.stages.setdefault(name, {"calls": 0, "wall_time": 0.0, "rows_in": 0, "rows_out": 0})
+
+    def add(self, name: str, **counters):
+        """
+        Add to the counters of a stage.
+
+        Args:
+            name (str): The stage name.
+            **counters: Amounts to add, e.g. bytes_downloaded=1024 or retries=1.
+        """
+        with self.lock:
+            stage = self._stage(name)
+            for key, value in counters.items():
+                if value:
+                    stage[key] = stage.get(key, 0) + value
+
+    def value(self, name: str, key: str):
+        """
+        Read one counter of a stage.
+
+        Args:
+            name (str): The stage name.
+            key (str): The counter, e.g. 'calls' or 'retries'.
+
+        Returns:
+            The counter's value, or 0 if it has not been recorded.
+        """
+        with self.lock:
+            return self.stages.get(name, {}).get(key, 0)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = None):
+        """
+        Time a block of work as one call of a stage.
+
+        Args:
+            name (str): The stage name.
+            rows_in (int, optional): Number of rows handed to the stage.
+
+        Yields:
+            StageTimer: Set `rows_out` on it to record the rows the stage produced.
+        """
+        timer = StageTimer(rows_in)
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add(name, calls=1, wall_time=elapsed, rows_in=timer.rows_in, rows_out=timer.rows_out)
+
+    def report(self, **extra) -> dict:
+        """
+        Build the structured run report.
+
+        Args:
+            **extra: Additional top-level fields, e.g. the command-line arguments.
+
+        Returns:
+            dict: The run report, with per-stage metrics and derived throughput.
+        """
+        with self.lock:
+            duration = time.perf_counter() - self.started_clock
+            stages = {}
+            for name, values in self.stages.items():
+                stage = dict(values)
+                stage["wall_time"] = round(stage["wall_time"], 6)
+                if stage["wall_time"] > 0 and stage["rows_out"]:
+                    stage["rows_per_second"] = round(stage["rows_out"] / stage["wall_time"], 2)
+                stages[name] = stage
+
+        return {
+            **extra,
+            "started_at": self.started_at.isoformat(),
+            "duration": round(duration, 6),
+            "stages": stages,
+        }
+
+    def write_report(self, path: str, **extra) -> dict:
+        """
+        Write the run report as JSON.
+
+        Args:
+            path (str): Output file path.
+            **extra: Additional top-level fields.
+
+        Returns:
+            dict: The report that was written.
+        """
+        report = self.report(**extra)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        return report
+
+metrics = RunMetrics()
@@ -0,0 +1,139 @@
+from sqlalchemy import text
+
+class JobQueue:
+    """
+    Durable queue of per-game review jobs stored in the REVIEW_JOBS table.
+
+    Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number of processes can
+    pull from the queue concurrently without claiming the same game twice.
+    """
+
+    def __init__(self, db, max_attempts: int = 3, stale_after: int = 3600):
+        """
+        Initialize the queue.
+
+        Args:
+            db (Database): A connected Database instance.
+            max_attempts (int): Attempts before a failing job is marked 'failed'.
+            stale_after (int): Seconds after which a 'running' job is assumed abandoned and requeued.
+        """
+        self.db = db
+        self.max_attempts = max_attempts
+        self.stale_after = stale_after
+
+    def enqueue(self, appids: list = None) -> int:
+        """
+        Queue review jobs for the given games, or for every game in GAMES.
+
+        Jobs that are already running are left untouched; finished or failed jobs are queued again.
+
+        Args:
+            appids (list, optional): App IDs to queue. Defaults to all games.
+
+        Returns:
+            int: Number of jobs queued.
+        """
+        source = "SELECT appid FROM games"
+        params = {}
+        if appids is not None:
+            source += " WHERE appid = ANY(:appids)"
+            params["appids"] = [int(appid) for appid in appids]
+
+        with self.db.engine.connect() as conn:
+            result = conn.execute(text(f"""
+                INSERT INTO review_jobs (appid, status, attempts, enqueued_at)
+                SELECT appid, 'pending', 0, CURRENT_TIMESTAMP FROM ({source}) AS queued
+                ON CONFLICT (appid) DO UPDATE SET
+                    status = 'pending', attempts = 0, last_error = NULL, enqueued_at = EXCLUDED.enqueued_at
+                WHERE review_jobs.status <> 'running'
+            """), params)
+            conn.commit()
+
+        print(f"Queued {result.rowcount} review jobs.")
+        return result.rowcount
+
+    def claim(self, worker_id: str):
+        """
+        Claim the oldest pending job.
+
+        Args:
+            worker_id (str): Identifier of the claiming worker.
+
+        Returns:
+            int: The claimed App ID, or None if the queue is empty.
+        """
+        with self.db.engine.connect() as conn:
+            appid = conn.execute(text("""
+                UPDATE review_jobs
+                SET status = 'running', claimed_by = :worker_id, claimed_at = CURRENT_TIMESTAMP,
+                    attempts = attempts + 1
+                WHERE appid = (
+                    SELECT appid FROM review_jobs
+                    WHERE status = 'pending'
+                    ORDER BY enqueued_at, appid
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING appid
+            """), {"worker_id": worker_id}).scalar()
+            conn.commit()
+        return appid
+
+    def complete(self, appid: int, row_count: int):
+        """
+        Mark a job as done.
+
+        Args:
+            appid (int): The job's App ID.
+            row_count (int): Number of reviews the job loaded.
+        """
+        with self.db.engine.connect() as conn:
+            conn.execute(text("""
+                UPDATE review_jobs
+                SET status = 'done', finished_at = CURRENT_TIMESTAMP, rows_loaded = :row_count, last_error = NULL
+                WHERE appid = :appid
+            """), {"appid": int(appid), "row_count": int(row_count)})
+            conn.commit()
+
+    def fail(self, appid: int, error: str):
+        """
+        Record a failed attempt. The job is retried until it reaches max_attempts, then marked 'failed'.
+
+        Args:
+            appid (int): The job's App ID.
+            error (str): The error message.
+        """
+        with self.db.engine.connect() as conn:
+            conn.execute(text("""
+                UPDATE review_jobs
+                SET status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END,
+                    finished_at = CURRENT_TIMESTAMP, last_error = :error
+                WHERE appid = :appid
+            """), {"appid": int(appid), "error": error[:2000], "max_attempts": self.max_attempts})
+            conn.commit()
+
+    def requeue_stale(self) -> int:
+        """
+        Put jobs whose worker disappeared while running them back into the queue.
+
+        Returns:
+            int: Number of requeued jobs.
+        """
+        with self.db.engine.connect() as conn:
+            result = conn.execute(text("""
+                UPDATE review_jobs SET status = 'pending'
+                WHERE status = 'running' AND claimed_at < CURRENT_TIMESTAMP - make_interval(secs => :stale_after)
+            """), {"stale_after": self.stale_after})
+            conn.commit()
+        return result.rowcount
+
+    def counts(self) -> dict:
+        """
+        Count jobs per status.
+
+        Returns:
+            dict: Status to number of jobs.
+        """
+        with self.db.engine.connect() as conn:
+            rows = conn.execute(text("SELECT status, COUNT(*) FROM review_jobs GROUP BY status"))
+            return {status: count for status, count in rows}
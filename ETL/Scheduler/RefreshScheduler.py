@@ -0,0 +1,273 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from Monitoring.RunMetrics import metrics
+
+REVIEWS_PER_PAGE = 100
+SECONDS_PER_DAY = 86400
+
+def plan_refresh_intervals(velocities: dict, daily_budget: float, min_interval: float, max_interval: float) -> dict:
+    """
+    Assign every game a refresh interval so the expected requests per day fit the budget.
+
+    Every refresh costs one request plus one per page of new reviews. The page cost depends only on the
+    game's velocity, not on how often it is polled, so it is reserved first. The remaining budget is split
+    into poll frequencies proportional to the square root of each game's velocity, which minimises the
+    total number of reviews waiting to be fetched. Frequencies are clamped to [1/max_interval, 1/min_interval]
+    and the budget freed or used by clamped games is redistributed among the rest.
+
+    Args:
+        velocities (dict): App ID to review velocity in reviews per day.
+        daily_budget (float): Requests per day available for refreshes.
+        min_interval (float): Shortest allowed refresh interval in seconds.
+        max_interval (float): Longest allowed refresh interval in seconds.
+
+    Returns:
+        dict: App ID to refresh interval in seconds.
+    """
+    min_frequency = SECONDS_PER_DAY / max_interval
+    max_frequency = SECONDS_PER_DAY / min_interval
+    remaining = daily_budget - sum(velocities.values()) / REVIEWS_PER_PAGE
+
+    frequencies = {}
+    free = {appid: math.sqrt(velocity) for appid, velocity in velocities.items()}
+    while free:
+        total_weight = sum(free.values())
+        if remaining <= 0 or total_weight == 0:
+            frequencies.update((appid, min_frequency) for appid in free)
+            break
+
+        clamped = {}
+        for appid, weight in free.items():
+            frequency = remaining * weight / total_weight
+            if frequency < min_frequency:
+                clamped[appid] = min_frequency
+            elif frequency > max_frequency:
+                clamped[appid] = max_frequency
+
+        if not clamped:
+            frequencies.update((appid, remaining * weight / total_weight) for appid, weight in free.items())
+            break
+
+        frequencies.update(clamped)
+        remaining -= sum(clamped.values())
+        for appid in clamped:
+            del free[appid]
+
+    return {appid: SECONDS_PER_DAY / frequency for appid, frequency in frequencies.items()}
+
+class RefreshScheduler:
+    """
+    Keeps the REFRESH_SCHEDULE table, which decides when each game's reviews are synced next.
+
+    Games are ranked by review velocity: the larger of the rate of reviews created over the last
+    `velocity_days` days and the rate of reviews returned by the game's last refresh. Intervals are
+    sized by plan_refresh_intervals so active titles stay fresh and dormant ones are polled rarely.
+    """
+
+    def __init__(self, db, daily_budget: float, min_interval: float = 3600, max_interval: float = 30 * SECONDS_PER_DAY,
+                 velocity_days: int = 30, initial_window: float = 365 * SECONDS_PER_DAY):
+        """
+        Initialize the scheduler.
+
+        Args:
+            db (Database): A connected Database instance.
+            daily_budget (float): Steam API requests per day available for refreshes.
+            min_interval (float): Shortest refresh interval in seconds.
+            max_interval (float): Longest refresh interval in seconds.
+            velocity_days (int): Window of REVIEWS.timestamp_created used to measure velocity.
+            initial_window (float): Seconds covered by a game's first sync, used to turn its yield into a rate.
+        """
+        self.db = db
+        self.daily_budget = daily_budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.velocity_days = velocity_days
+        self.initial_window = initial_window
+
+    def velocities(self) -> dict:
+        """
+        Measure the review velocity of every game.
+
+        Returns:
+            dict: App ID to reviews per day.
+        """
+        with self.db.engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT g.appid,
+                       GREATEST(COALESCE(r.recent_reviews, 0) / CAST(:velocity_days AS DOUBLE PRECISION),
+                                COALESCE(s.yield_per_day, 0)) AS velocity
+                FROM games g
+                LEFT JOIN (
+                    SELECT appid, COUNT(*) AS recent_reviews
+                    FROM reviews
+                    WHERE timestamp_created >= CURRENT_TIMESTAMP - make_interval(days => :velocity_days)
+                    GROUP BY appid
+                ) r ON r.appid = g.appid
+                LEFT JOIN refresh_schedule s ON s.appid = g.appid
+            """), {"velocity_days": self.velocity_days})
+            return {appid: float(velocity) for appid, velocity in rows}
+
+    def plan(self) -> dict:
+        """
+        Recompute every game's refresh interval and store it with its next refresh time.
+
+        Games that have been refreshed before are next due one interval after their last refresh.
+        New games are spread uniformly over their first interval so they are not all due at once.
+
+        Returns:
+            dict: App ID to refresh interval in seconds.
+        """
+        with metrics.stage("schedule.plan") as stage:
+            velocities = self.velocities()
+            intervals = plan_refresh_intervals(velocities, self.daily_budget, self.min_interval, self.max_interval)
+            appids = list(intervals)
+
+            with self.db.engine.connect() as conn:
+                conn.execute(text("""
+                    INSERT INTO refresh_schedule (appid, velocity, refresh_interval, next_refresh_at)
+                    SELECT appid, velocity, refresh_interval,
+                           CURRENT_TIMESTAMP + make_interval(secs => refresh_interval * random())
+                    FROM unnest(CAST(:appids AS INT[]), CAST(:velocities AS DOUBLE PRECISION[]),
+                                CAST(:intervals AS DOUBLE PRECISION[])) AS plan (appid, velocity, refresh_interval)
+                    ON CONFLICT (appid) DO UPDATE SET
+                        velocity = EXCLUDED.velocity,
+                        refresh_interval = EXCLUDED.refresh_interval,
+                        next_refresh_at = CASE
+                            WHEN refresh_schedule.last_refreshed_at IS NULL THEN refresh_schedule.next_refresh_at
+                            ELSE refresh_schedule.last_refreshed_at + make_interval(secs => EXCLUDED.refresh_interval)
+                        END
+                """), {
+                    "appids": appids,
+                    "velocities": [velocities[appid] for appid in appids],
+                    "intervals": [intervals[appid] for appid in appids],
+                })
+                conn.commit()
+            stage.rows_out = len(intervals)
+
+        active = sum(1 for velocity in velocities.values() if velocity > 0)
+        print(f"Planned refreshes for {len(intervals)} games ({active} with recent reviews) "
+              f"within {self.daily_budget:,.0f} requests per day.")
+        return intervals
+
+    def due_games(self, limit: int) -> list:
+        """
+        List the games whose next refresh is due, fastest-moving first.
+
+        Args:
+            limit (int): Maximum number of games returned.
+
+        Returns:
+            list: App IDs.
+        """
+        with self.db.engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT appid FROM refresh_schedule
+                WHERE next_refresh_at <= CURRENT_TIMESTAMP
+                ORDER BY velocity DESC, next_refresh_at
+                LIMIT :limit
+            """), {"limit": limit})
+            return [appid for appid, in rows]
+
+    def seconds_until_next_due(self) -> float:
+        """
+        Returns:
+            float: Seconds until the next refresh is due, or None if nothing is scheduled.
+        """
+        with self.db.engine.connect() as conn:
+            seconds = conn.execute(text(
+                "SELECT EXTRACT(EPOCH FROM MIN(next_refresh_at) - CURRENT_TIMESTAMP) FROM refresh_schedule"
+            )).scalar()
+        return None if seconds is None else max(0.0, float(seconds))
+
+    def record_refresh(self, appid: int, row_count: int):
+        """
+        Store the yield of a refresh and schedule the game's next one.
+
+        Args:
+            appid (int): Steam App ID of the game.
+            row_count (int): Number of reviews the refresh returned.
+        """
+        with self.db.engine.connect() as conn:
+            conn.execute(text("""
+                UPDATE refresh_schedule SET
+                    yield_per_day = CAST(:row_count AS DOUBLE PRECISION) * :seconds_per_day / CAST(GREATEST(
+                        COALESCE(EXTRACT(EPOCH FROM CURRENT_TIMESTAMP - last_refreshed_at), :initial_window), 1
+                    ) AS DOUBLE PRECISION),
+                    last_yield = :row_count,
+                    last_refreshed_at = CURRENT_TIMESTAMP,
+                    next_refresh_at = CURRENT_TIMESTAMP + make_interval(secs => refresh_interval)
+                WHERE appid = :appid
+            """), {
+                "appid": int(appid),
+                "row_count": int(row_count),
+                "seconds_per_day": SECONDS_PER_DAY,
+                "initial_window": self.initial_window,
+            })
+            conn.commit()
+
+    def postpone(self, appid: int):
+        """
+        Schedule the next refresh of a game whose refresh failed one interval from now.
+
+        Args:
+            appid (int): Steam App ID of the game.
+        """
+        with self.db.engine.connect() as conn:
+            conn.execute(text("""
+                UPDATE refresh_schedule
+                SET next_refresh_at = CURRENT_TIMESTAMP + make_interval(secs => refresh_interval)
+                WHERE appid = :appid
+            """), {"appid": int(appid)})
+            conn.commit()
+
+    def run_forever(self, process_game, workers: int = 4, replan_interval: float = 3600, poll_interval: float = 60):
+        """
+        Refresh due games until interrupted.
+
+        The plan is recomputed every `replan_interval` seconds. Requests are counted per UTC day, and once
+        the daily budget is spent the daemon waits for the next day.
+
+        Args:
+            process_game (callable): Called with an App ID; syncs the game and returns the number of reviews.
+            workers (int): Number of games refreshed at the same time.
+            replan_interval (float): Seconds between plan recomputations.
+            poll_interval (float): Longest sleep between checks for due games.
+        """
+        planned_at = None
+        day = None
+        day_start_requests = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                now = datetime.now(timezone.utc)
+                requests_made = metrics.value("extract.http", "calls")
+                if now.date() != day:
+                    day = now.date()
+                    day_start_requests = requests_made
+                if requests_made - day_start_requests >= self.daily_budget:
+                    tomorrow = datetime.combine(day + timedelta(days=1), datetime.min.time(), timezone.utc)
+                    print(f"Daily request budget spent; sleeping until {tomorrow.isoformat()}.")
+                    time.sleep((tomorrow - now).total_seconds())
+                    continue
+
+                if planned_at is None or time.monotonic() - planned_at >= replan_interval:
+                    self.plan()
+                    planned_at = time.monotonic()
+
+                due = self.due_games(workers * 4)
+                if not due:
+                    wait = self.seconds_until_next_due()
+                    time.sleep(poll_interval if wait is None else min(max(wait, 1.0), poll_interval))
+                    continue
+
+                futures = {executor.submit(process_game, appid): appid for appid in due}
+                for future in as_completed(futures):
+                    appid = futures[future]
+                    try:
+                        self.record_refresh(appid, future.result())
+                    except Exception as e:
+                        print(f"Game {appid}: refresh failed: {e}")
+                        self.postpone(appid)
@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import ExtractData.HttpClient as HttpClient
+from Scheduler.JobQueue import JobQueue
+
+def worker_loop(worker_id: str, make_db, process_game, http_options: dict, rate_limiter, max_attempts: int):
+    """
+    Claim and process review jobs until the queue is empty. Runs inside a worker process.
+
+    Args:
+        worker_id (str): Identifier recorded on claimed jobs.
+        make_db (callable): Returns a new, unconnected Database; each worker has its own connection pool.
+        process_game (callable): Called as process_game(db, appid); returns the number of reviews loaded.
+        http_options (dict): HttpClient arguments for this worker.
+        rate_limiter (SharedTokenBucket): Request budget shared by all workers.
+        max_attempts (int): Attempts before a failing job is marked 'failed'.
+    """
+    HttpClient.configure(rate_limiter=rate_limiter, **http_options)
+
+    db = make_db()
+    if not db.connect():
+        return
+
+    queue = JobQueue(db, max_attempts)
+    processed = 0
+    while True:
+        appid = queue.claim(worker_id)
+        if appid is None:
+            break
+        try:
+            row_count = process_game(db, appid)
+            queue.complete(appid, row_count)
+            print(f"[{worker_id}] Game {appid}: loaded {row_count} reviews.")
+        except Exception as e:
+            queue.fail(appid, str(e))
+            print(f"[{worker_id}] Game {appid}: failed: {e}")
+        processed += 1
+
+    db.engine.dispose()
+    print(f"[{worker_id}] Queue empty after {processed} jobs.")
+
+def run_workers(workers: int, make_db, process_game, http_options: dict, rate_limiter, max_attempts: int = 3):
+    """
+    Start worker processes that drain the review job queue, and wait for them to finish.
+
+    Args:
+        workers (int): Number of worker processes.
+        make_db (callable): Returns a new, unconnected Database. Must be picklable.
+        process_game (callable): Called as process_game(db, appid). Must be picklable.
+        http_options (dict): HttpClient arguments for the workers.
+        rate_limiter (SharedTokenBucket): Request budget shared by all workers.
+        max_attempts (int): Attempts before a failing job is marked 'failed'.
+    """
+    processes = [
+        multiprocessing.Process(
+            target=worker_loop,
+            args=(f"{os.uname().nodename}-{os.getpid()}-{index}", make_db, process_game, http_options,
+                  rate_limiter, max_attempts),
+            name=f"review-worker-{index}",
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    failed = [process.name for process in processes if process.exitcode != 0]
+    if failed:
+        print(f"Workers exited with errors: {', '.join(failed)}")
@@ -1,23 +1,114 @@
+import numpy as np
 import pandas as pd
+from Monitoring.RunMetrics import metrics
 
-def transform_unix_to_datetime(df, columns):
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    STRING_DTYPE = "string"
+
+CONTENT_HASH_COLUMN = 'content_hash'
+TIMESTAMP_DTYPE = 'datetime64[ns]'
+
+# Target dtypes of the load-ready frames, in column order. Columns declared NOT NULL in the schema use
+# plain NumPy dtypes with missing values filled with 0; the others use nullable dtypes.
+USER_DTYPES = {
+    'steamid': 'int64',
+    'num_games_owned': 'int32',
+    'num_reviews': 'int32',
+}
+
+REVIEW_DTYPES = {
+    'appid': 'int32',
+    'recommendationid': 'int64',
+    'language': STRING_DTYPE,
+    'timestamp_created': TIMESTAMP_DTYPE,
+    'timestamp_updated': TIMESTAMP_DTYPE,
+    'voted_up': 'boolean',
+    'votes_up': 'Int32',
+    'votes_funny': 'Int32',
+    'weighted_vote_score': 'Float64',
+    'comment_count': 'Int32',
+    'steam_purchase': 'boolean',
+    'received_for_free': 'boolean',
+    'written_during_early_access': 'boolean',
+    'primarily_steam_deck': 'boolean',
+    'steamid': 'int64',
+    'playtime_at_review': 'int32',
+    'playtime_forever': 'int32',
+    'playtime_last_two_weeks': 'int32',
+    'last_played': TIMESTAMP_DTYPE,
+}
+
+def add_content_hash(reviews_df: pd.DataFrame, key_column: str = 'recommendationid') -> pd.DataFrame:
+    """
+    Fingerprint every review so unchanged rows can be recognised on a later load.
+
+    The hash covers every extracted column except the key, in a fixed column order, so any change to
+    votes, playtime, timestamps or the author's counts produces a different value.
+
+    Args:
+        reviews_df (pd.DataFrame): Cleaned review data as extracted.
+        key_column (str): The review's identifier, left out of the hash.
+
+    Returns:
+        pd.DataFrame: A copy of the data with a signed 64-bit CONTENT_HASH_COLUMN.
+    """
+    hashed_columns = sorted(column for column in reviews_df.columns
+                            if column not in (key_column, CONTENT_HASH_COLUMN))
+    hashes = pd.util.hash_pandas_object(reviews_df[hashed_columns], index=False).to_numpy()
+    return reviews_df.assign(**{CONTENT_HASH_COLUMN: hashes.view(np.int64)})
+
+def convert_column(series: pd.Series, dtype: str) -> pd.Series:
     """
-    Convert specified Unix timestamp columns in a DataFrame to datetime format.
+    Convert a column to a declared target dtype in one vectorized step.
+
+    Text is parsed as numbers where a numeric dtype is requested, unparseable values become missing,
+    timestamp columns are read as Unix seconds and non-nullable integer dtypes get 0 for missing values.
+
+    Args:
+        series (pd.Series): The source column. It is not modified.
+        dtype (str): The target dtype.
+
+    Returns:
+        pd.Series: The converted column.
+    """
+    if dtype == TIMESTAMP_DTYPE:
+        values = series if pd.api.types.is_numeric_dtype(series) else pd.to_numeric(series, errors='coerce')
+        return pd.to_datetime(values, unit='s', errors='coerce')
+    if dtype in ('string', STRING_DTYPE) or dtype == 'boolean':
+        return series.astype(dtype)
+
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series, errors='coerce')
+    if isinstance(pd.api.types.pandas_dtype(dtype), np.dtype) and series.hasnans:
+        series = series.fillna(0)
+    return series.astype(dtype)
+
+def latest_review_positions(steamids: np.ndarray, timestamp_updated: pd.Series) -> np.ndarray:
+    """
+    Find each user's most recently updated review in a batch.
 
     Args:
-        df (pd.DataFrame): The input DataFrame containing Unix timestamps.
-        columns (list): List of column names to convert.
+        steamids (np.ndarray): Author of every review.
+        timestamp_updated (pd.Series): Update time of every review. Missing times sort first.
 
     Returns:
-        pd.DataFrame: The DataFrame with converted datetime columns.
+        np.ndarray: Ascending positions of one review per user; of equally recent reviews the last one is kept.
     """
-    for col in columns:
-        df[col] = pd.to_datetime(pd.to_numeric(df[col], errors='coerce'), unit='s', errors='coerce')
-    return df
+    # idxmax keeps the first maximum, so the batch is grouped in reverse to keep the last one instead.
+    updated = timestamp_updated.to_numpy().view(np.int64)[::-1]
+    latest = pd.Series(updated).groupby(steamids[::-1], sort=False).idxmax().to_numpy()
+    return np.sort(len(steamids) - 1 - latest)
 
 def transform_review_data(gameid, reviews_df: pd.DataFrame):
     """
-    Transform raw review data by cleaning types, extracting user info, and formatting timestamps.
+    Transform raw review data into load-ready USERS and REVIEWS frames.
+
+    Every column is converted once to its declared dtype in USER_DTYPES or REVIEW_DTYPES. The input is
+    not modified and both results own their data. Users are deduplicated by steamid, keeping the counts
+    from each user's most recently updated review in the batch.
 
     Args:
         gameid (int): Steam App ID associated with the reviews.
@@ -26,29 +117,37 @@ def transform_review_data(gameid, reviews_df: pd.DataFrame):
     Returns:
         tuple: A tuple containing two DataFrames — (users_df, review_data_df)
     """
-    reviews_df['appid'] = int(gameid)
-    reviews_df['weighted_vote_score'] = pd.to_numeric(reviews_df['weighted_vote_score']).round(2)
-
-    datetime_columns = ['timestamp_created', 'timestamp_updated', 'last_played']
-    reviews_df = transform_unix_to_datetime(reviews_df, datetime_columns)
-
-    playtime_columns = ['playtime_at_review', 'playtime_forever', 'playtime_last_two_weeks']
-    for col in playtime_columns:
-        reviews_df[col] = pd.to_numeric(reviews_df[col], errors='coerce').fillna(0).astype(int)
+    with metrics.stage("transform", rows_in=len(reviews_df)) as stage:
+        columns = {
+            name: convert_column(reviews_df[name], dtype)
+            for name, dtype in REVIEW_DTYPES.items() if name not in ('appid', 'weighted_vote_score')
+        }
+        columns['appid'] = np.full(len(reviews_df), int(gameid), dtype=REVIEW_DTYPES['appid'])
+        # Rounded as float64 first: rounding the nullable Float64 column is several times slower.
+        columns['weighted_vote_score'] = (
+            pd.to_numeric(reviews_df['weighted_vote_score'], errors='coerce').round(2)
+            .astype(REVIEW_DTYPES['weighted_vote_score'])
+        )
+        if CONTENT_HASH_COLUMN in reviews_df.columns:
+            columns[CONTENT_HASH_COLUMN] = reviews_df[CONTENT_HASH_COLUMN].astype('int64')
 
-    user_columns = [
-        'steamid', 'num_games_owned', 'num_reviews'
-    ]
+        review_columns = [*REVIEW_DTYPES, *([CONTENT_HASH_COLUMN] if CONTENT_HASH_COLUMN in columns else [])]
+        review_data_df = pd.DataFrame({name: columns[name] for name in review_columns}, copy=False)
+        review_data_df.index = pd.RangeIndex(len(review_data_df))
 
-    review_columns = [
-        'appid', 'recommendationid', 'language', 'timestamp_created', 'timestamp_updated',
-        'voted_up', 'votes_up', 'votes_funny', 'weighted_vote_score', 'comment_count',
-        'steam_purchase', 'received_for_free', 'written_during_early_access',
-        'primarily_steam_deck', 'steamid', 'playtime_at_review', 'playtime_forever',
-        'playtime_last_two_weeks', 'last_played'
-    ]
+        steamids = columns['steamid'].to_numpy()
+        user_columns = {
+            'steamid': steamids,
+            **{
+                name: convert_column(reviews_df[name], dtype).to_numpy()
+                for name, dtype in USER_DTYPES.items() if name != 'steamid'
+            },
+        }
+        if columns['steamid'].duplicated().any():
+            latest = latest_review_positions(steamids, columns['timestamp_updated'])
+            user_columns = {name: values[latest] for name, values in user_columns.items()}
+        users_df = pd.DataFrame(user_columns, copy=False)
 
-    users_df = reviews_df[user_columns]
-    review_data_df = reviews_df[review_columns]
+        stage.rows_out = len(review_data_df)
 
-    return users_df, review_data_df
\ No newline at end of file
+    return users_df, review_data_df
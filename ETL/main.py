@@ -1,39 +1,324 @@
+from __future__ import annotations
 import argparse
-import ExtractData.ExtractSteamData as ExtractSteamData
-from LoadData.LoadSteamData import Database
-import TransformData.TransformSteamData as TransformData
+import cProfile
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import TYPE_CHECKING
+from ExtractData.Checkpoint import DEFAULT_SPOOL_DIR, PageSpool
+from ExtractData.RateLimiter import SharedTokenBucket, TokenBucket
+from LoadData.ExportWriters import EXPORT_FORMATS
+from LoadData.UserCache import DEFAULT_USER_CACHE_SIZE
+from Monitoring.RunMetrics import metrics
 
-def cron_job_fetch_games(db: Database):
+# pandas, SQLAlchemy and requests are imported by the functions that need them,
+# so --help and runs without an action start without loading them.
+if TYPE_CHECKING:
+    from LoadData.LoadSteamData import Database
+
+INCREMENTAL_LOOKBACK_DAYS = 365
+
+def cron_job_fetch_games(db: Database, refresh_mode: str = 'diff', batch_size: int = 10000):
+    """
+    Fetch all available Steam games and refresh the GAMES table in the database.
+
+    The app list is streamed to the database in batches, so memory use stays constant.
+
+    Args:
+        db (Database): The database connection instance.
+        refresh_mode (str): 'diff' applies only inserted, renamed and removed games;
+            'replace' deletes and reloads the whole table.
+        batch_size (int): Number of games handed to the loader at a time.
     """
-    Fetch all available Steam games and replace the GAMES table in the database.
+    import ExtractData.ExtractSteamData as ExtractSteamData
+
+    batches = ExtractSteamData.iter_all_steam_games(batch_size)
+    if refresh_mode == 'replace':
+        db.replace_table(batches, "games")
+    else:
+        db.refresh_games(batches, "games")
+
+def cron_job_fetch_all_sql_data(db: Database, output_dir: str = None, fmt: str = 'parquet', since=None):
+    """
+    Export all SQL tables (GAMES, REVIEWS, USERS) to files, streaming them in chunks.
+
+    Args:
+        db (Database): The database connection instance.
+        output_dir (str, optional): The directory to save files. Defaults to the Desktop.
+        fmt (str): 'parquet', 'csv', 'csv.gz' or 'csv.zst'.
+        since (datetime | str, optional): Only export rows changed since this time, or 'last'.
     """
-    games_df = ExtractSteamData.fetch_all_steam_games()
-    db.replace_table(games_df, "GAMES")
+    db.export_tables(output_dir, fmt, since=since)
 
-def cron_job_fetch_all_sql_data(db: Database):
+def load_review_chunk(db: Database, gameid, reviews_df) -> int:
     """
-    Export all SQL tables (GAMES, REVIEWS, USERS) to CSV files.
+    Transform one chunk of cleaned reviews, upsert it into the USERS and REVIEWS tables
+    and refresh the review summaries of the chunk's users.
+
+    Reviews whose content hash matches the stored row are dropped before the transform,
+    so re-syncing a game only processes the reviews that changed. Of the chunk's users only
+    new ones and those whose stats changed are written (see Database.upsert_users).
+
+    Args:
+        db (Database): The database connection instance.
+        gameid (int): Steam App ID of the game.
+        reviews_df (pd.DataFrame): Cleaned review data.
+
+    Returns:
+        int: Number of new or changed reviews loaded.
     """
-    db.export_tables_to_csv()
+    import TransformData.TransformSteamData as TransformData
+
+    reviews_df = db.drop_unchanged_rows(TransformData.add_content_hash(reviews_df), "reviews")
+    if reviews_df.empty:
+        return 0
+
+    users_df, reviews_df = TransformData.transform_review_data(gameid, reviews_df)
+    db.upsert_users(users_df, "users")
+    db.append_table(reviews_df, "reviews")
+    db.refresh_review_stats(steamids=reviews_df['steamid'].unique().tolist())
+    return len(reviews_df)
 
-def fetch_reviews_for_game(db: Database, gameid, review_limit):
+def fetch_reviews_for_game(db: Database, gameid, review_limit, chunk_size: int = 1000, spool_dir: str = None,
+                           resume: bool = False, windows: int = 1):
     """
     Fetch reviews for a specific game by ID, transform the data, and insert into USERS and REVIEWS tables.
 
+    Reviews are streamed through extract, transform and load in chunks, so each chunk
+    reaches the database as soon as it has been fetched. When a spool directory is given,
+    every fetched page is also written to disk and the spool is removed once all chunks are loaded.
+
+    Args:
+        db (Database): The database connection instance.
+        gameid (int): Steam App ID of the game.
+        review_limit (int): Optional limit on number of reviews to fetch.
+        chunk_size (int): Number of reviews processed per chunk.
+        spool_dir (str, optional): Directory fetched pages are spooled to.
+        resume (bool): Continue from the pages spooled by an interrupted run.
+        windows (int): Number of offset ranges of the game fetched concurrently. Pages are not spooled when above 1.
+
+    Returns:
+        int: Number of reviews processed.
+    """
+    import ExtractData.ExtractSteamData as ExtractSteamData
+
+    spool = PageSpool(spool_dir, gameid) if spool_dir and windows <= 1 else None
+
+    row_count = 0
+    for reviews_df in ExtractSteamData.stream_game_reviews(gameid, review_limit, chunk_size, spool, resume, windows):
+        row_count += load_review_chunk(db, gameid, reviews_df)
+    db.refresh_review_stats(appids=[gameid])
+
+    if spool is not None:
+        spool.clear()
+    return row_count
+
+def sync_reviews_for_game(db: Database, gameid, review_limit, chunk_size: int = 1000):
+    """
+    Incrementally fetch reviews updated since the game's last sync and advance its checkpoint.
+
+    Games without a checkpoint are synced over the last INCREMENTAL_LOOKBACK_DAYS days.
+    The checkpoint is only saved once every chunk has been loaded. Reviews are fetched newest first,
+    so when the review limit stops the fetch before the checkpoint is reached, the checkpoint is
+    kept and the cursor of the next page is saved; the next sync continues from it and, once it
+    reaches the checkpoint, advances it to the newest review stored for the game.
+
     Args:
         db (Database): The database connection instance.
         gameid (int): Steam App ID of the game.
         review_limit (int): Optional limit on number of reviews to fetch.
+        chunk_size (int): Number of reviews processed per chunk.
+
+    Returns:
+        int: Number of reviews processed.
     """
-    reviews_df = ExtractSteamData.fetch_game_reviews(gameid, review_limit)
-    users_df, reviews_df = TransformData.transform_review_data(gameid, reviews_df)
-    db.append_table(users_df, "USERS")
-    db.append_table(reviews_df, "REVIEWS")
+    import ExtractData.ExtractSteamData as ExtractSteamData
+
+    checkpoint = db.get_sync_state(gameid) or {}
+    since_timestamp = checkpoint.get('last_timestamp_updated')
+    if since_timestamp is None:
+        since_timestamp = int(time.time()) - INCREMENTAL_LOOKBACK_DAYS * 86400
+    resume_cursor = checkpoint.get('last_cursor')
+
+    state = {}
+    row_count = 0
+    reviews = ExtractSteamData.stream_updated_reviews(gameid, since_timestamp, review_limit, chunk_size, state,
+                                                      resume_cursor or "*")
+    for reviews_df in reviews:
+        row_count += load_review_chunk(db, gameid, reviews_df)
+    if row_count:
+        db.refresh_review_stats(appids=[gameid])
+
+    if state.get('truncated'):
+        db.save_sync_state(gameid, since_timestamp, state['cursor'])
+        print(f"Game {gameid}: stopped at the review limit; the next sync continues from cursor {state['cursor']}.")
+    else:
+        # A resumed sync only saw the older part of the gap; the newest reviews were loaded by the syncs before it.
+        newest = state.get('newest_timestamp_updated', since_timestamp)
+        if resume_cursor:
+            newest = max(newest, db.get_newest_review_timestamp(gameid) or since_timestamp)
+        db.save_sync_state(gameid, newest)
+    print(f"Game {gameid}: {row_count} reviews updated since {since_timestamp}.")
+    return row_count
+
+def fetch_reviews_for_games(db: Database, gameids, review_limit, workers: int = 4, chunk_size: int = 1000,
+                            incremental: bool = False, spool_dir: str = None, resume: bool = False,
+                            windows: int = 1):
+    """
+    Fetch reviews for many games concurrently. All workers share the HTTP client and its rate limit.
+
+    A failure for one game is reported and does not abort the rest of the batch.
+
+    Args:
+        db (Database): The database connection instance.
+        gameids (list): Steam App IDs to process.
+        review_limit (int): Optional limit on number of reviews fetched per game.
+        workers (int): Number of games processed at the same time.
+        chunk_size (int): Number of reviews processed per chunk.
+        incremental (bool): Only fetch reviews updated since each game's last sync.
+        spool_dir (str, optional): Directory fetched pages are spooled to (full fetches only).
+        resume (bool): Continue each game from the pages spooled by an interrupted run.
+        windows (int): Number of offset ranges of each game fetched concurrently (full fetches only).
+
+    Returns:
+        dict: Mapping of failed App IDs to their error message.
+    """
+    if incremental:
+        fetch_game = partial(sync_reviews_for_game, db, review_limit=review_limit, chunk_size=chunk_size)
+    else:
+        fetch_game = partial(fetch_reviews_for_game, db, review_limit=review_limit, chunk_size=chunk_size,
+                             spool_dir=spool_dir, resume=resume, windows=windows)
+    failures = {}
+    completed = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(fetch_game, gameid): gameid
+            for gameid in gameids
+        }
+        for future in as_completed(futures):
+            gameid = futures[future]
+            completed += 1
+            try:
+                row_count = future.result()
+                print(f"[{completed}/{len(gameids)}] Game {gameid}: loaded {row_count} reviews.")
+            except Exception as e:
+                failures[gameid] = str(e)
+                print(f"[{completed}/{len(gameids)}] Game {gameid}: failed: {e}")
+
+    print(f"Batch finished: {len(gameids) - len(failures)} succeeded, {len(failures)} failed.")
+    return failures
+
+def run_review_workers(db: Database, args):
+    """
+    Drain the REVIEW_JOBS queue with worker processes, each running extract, transform and load
+    for the games it claims over its own database connection pool. All workers share one request budget.
+
+    Args:
+        db (Database): The database connection instance, used to requeue abandoned jobs.
+        args (argparse.Namespace): Parsed arguments.
+    """
+    from LoadData.LoadSteamData import Database
+    from Scheduler.JobQueue import JobQueue
+    from Scheduler.Workers import run_workers
+
+    queue = JobQueue(db, args.job_attempts)
+    requeued = queue.requeue_stale()
+    if requeued:
+        print(f"Requeued {requeued} abandoned review jobs.")
+
+    if args.incremental:
+        process_game = partial(sync_reviews_for_game, review_limit=args.review_limit, chunk_size=args.chunk_size)
+    else:
+        process_game = partial(fetch_reviews_for_game, review_limit=args.review_limit, chunk_size=args.chunk_size,
+                               spool_dir=None if args.no_spool else args.spool_dir, resume=True,
+                               windows=args.offset_windows)
+
+    http_options = {
+        "timeout": (5.0, args.http_timeout),
+        "max_attempts": args.max_attempts,
+        "cache_dir": args.http_cache_dir,
+        "cache_ttl": args.http_cache_ttl,
+        "pool_size": max(16, args.offset_windows),
+    }
+    make_db = partial(Database, args.load_method, args.load_chunk_size, user_cache_size=args.user_cache_size)
+    db.engine.dispose()
+    run_workers(args.run_workers, make_db, process_game, http_options, SharedTokenBucket(args.requests_per_second),
+                args.job_attempts)
+    print(f"Review jobs: {queue.counts()}")
+
+def run_refresh_daemon(db: Database, args):
+    """
+    Keep review data fresh until interrupted: games are synced incrementally on intervals sized
+    by their review velocity so that all refreshes fit the daily request budget.
+
+    Args:
+        db (Database): The database connection instance.
+        args (argparse.Namespace): Parsed arguments.
+    """
+    from Scheduler.RefreshScheduler import RefreshScheduler
+
+    scheduler = RefreshScheduler(
+        db,
+        args.daily_request_budget,
+        args.min_refresh_interval,
+        args.max_refresh_interval,
+        initial_window=INCREMENTAL_LOOKBACK_DAYS * 86400
+    )
+    process_game = partial(sync_reviews_for_game, db, review_limit=args.review_limit, chunk_size=args.chunk_size)
+    try:
+        scheduler.run_forever(process_game, args.workers, args.replan_interval)
+    except KeyboardInterrupt:
+        print("Refresh daemon stopped.")
+
+def read_game_ids_file(path: str) -> list:
+    """
+    Read App IDs from a text file, one per line. Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        list: App IDs as ints, in file order without duplicates.
+    """
+    gameids = []
+    seen = set()
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            gameid = int(line)
+            if gameid not in seen:
+                seen.add(gameid)
+                gameids.append(gameid)
+    return gameids
+
+def parse_since(value: str):
+    """
+    Parse the --since argument.
+
+    Args:
+        value (str): An ISO date/time or 'last'.
+
+    Returns:
+        datetime | str: The parsed time in UTC, or 'last'. Times without an offset are taken as UTC.
+    """
+    if value == 'last':
+        return value
+    try:
+        since = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid --since value '{value}'. Use an ISO date/time or 'last'.")
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
 
 def parse_arguments():
     """
     Parse command-line arguments to determine which ETL operation to run.
-    
+
     Returns:
         argparse.Namespace: Parsed arguments.
     """
@@ -45,42 +330,320 @@ def parse_arguments():
         action='store_true',
         help='Fetch and update the newest games from Steam.'
     )
+    parser.add_argument(
+        '--games-refresh',
+        choices=['diff', 'replace'],
+        default='diff',
+        help='How --update-games applies the app list: only the differences (diff) or a full reload (replace).'
+    )
     parser.add_argument(
         '--fetch-sql-data',
         action='store_true',
-        help='Export all SQL tables to CSV files.'
+        help='Export all SQL tables to files.'
+    )
+    parser.add_argument(
+        '--export-format',
+        choices=list(EXPORT_FORMATS),
+        default='parquet',
+        help='File format of --fetch-sql-data exports.'
+    )
+    parser.add_argument(
+        '--export-dir',
+        type=str,
+        default=None,
+        help='Directory --fetch-sql-data writes to (default: the Desktop).'
+    )
+    parser.add_argument(
+        '--since',
+        type=parse_since,
+        default=None,
+        help="Only export rows loaded since an ISO date/time (UTC unless an offset is given), "
+             "or 'last' for the previous export."
+    )
+    parser.add_argument(
+        '--refresh-analytics',
+        action='store_true',
+        help='Rebuild the per-game and per-user review summary tables from scratch.'
+    )
+    parser.add_argument(
+        '--detach-reviews-before',
+        type=str,
+        default=None,
+        metavar='YYYY-MM',
+        help='Detach monthly REVIEWS partitions older than this month so they can be archived.'
+    )
+    parser.add_argument(
+        '--enqueue-games',
+        action='store_true',
+        help='Queue a review job for every game in GAMES (or in --game-ids-file).'
+    )
+    parser.add_argument(
+        '--run-workers',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Process the queued review jobs with N worker processes.'
+    )
+    parser.add_argument(
+        '--job-attempts',
+        type=int,
+        default=3,
+        help='Attempts per queued review job before it is marked failed.'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Run until interrupted, refreshing reviews of fast-moving games more often than dormant ones.'
+    )
+    parser.add_argument(
+        '--daily-request-budget',
+        type=float,
+        default=100000,
+        help='Steam API requests per day the --daemon refreshes may use.'
+    )
+    parser.add_argument(
+        '--min-refresh-interval',
+        type=float,
+        default=3600,
+        help='Shortest interval in seconds between two --daemon refreshes of a game.'
+    )
+    parser.add_argument(
+        '--max-refresh-interval',
+        type=float,
+        default=30 * 86400,
+        help='Longest interval in seconds between two --daemon refreshes of a game.'
+    )
+    parser.add_argument(
+        '--replan-interval',
+        type=float,
+        default=3600,
+        help='Seconds between recomputations of the --daemon refresh plan.'
     )
     parser.add_argument(
         '--game-id',
         type=int,
         help='Fetch reviews for a specific game by its App ID.'
     )
+    parser.add_argument(
+        '--game-ids-file',
+        type=str,
+        help='Fetch reviews for every App ID listed in a file (one per line).'
+    )
+    parser.add_argument(
+        '--all-games',
+        action='store_true',
+        help='Fetch reviews for every App ID in the GAMES table.'
+    )
     parser.add_argument(
         '--review-limit',
         type=int,
         default=None,
         help='Limit the number of reviews fetched.'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only fetch reviews updated since the last sync of each game.'
+    )
+    parser.add_argument(
+        '--spool-dir',
+        type=str,
+        default=DEFAULT_SPOOL_DIR,
+        help='Directory fetched review pages are spooled to so interrupted runs can be resumed.'
+    )
+    parser.add_argument(
+        '--no-spool',
+        action='store_true',
+        help='Do not spool fetched review pages to disk.'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue interrupted review fetches from their spooled pages instead of starting over.'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=1000,
+        help='Number of reviews extracted, transformed and loaded per chunk.'
+    )
+    parser.add_argument(
+        '--load-method',
+        choices=['to_sql', 'copy'],
+        default='to_sql',
+        help='How rows are written to Postgres: row INSERTs (to_sql) or bulk COPY FROM STDIN (copy).'
+    )
+    parser.add_argument(
+        '--load-chunk-size',
+        type=int,
+        default=10000,
+        help='Number of rows sent to the database per batch.'
+    )
+    parser.add_argument(
+        '--user-cache-size',
+        type=int,
+        default=DEFAULT_USER_CACHE_SIZE,
+        help='Users whose stored stats are kept in memory to skip rewriting unchanged USERS rows (0 disables).'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of games fetched concurrently in batch mode.'
+    )
+    parser.add_argument(
+        '--offset-windows',
+        type=int,
+        default=1,
+        help='Split each game\'s reviews into this many offset ranges fetched concurrently (full fetches only; '
+             'disables page spooling).'
+    )
+    parser.add_argument(
+        '--requests-per-second',
+        type=float,
+        default=4.0,
+        help='Request budget shared by all concurrent fetches.'
+    )
+    parser.add_argument(
+        '--http-timeout',
+        type=float,
+        default=30.0,
+        help='Read timeout in seconds for Steam API requests.'
+    )
+    parser.add_argument(
+        '--max-attempts',
+        type=int,
+        default=6,
+        help='Maximum attempts per Steam API request before giving up.'
+    )
+    parser.add_argument(
+        '--http-cache-dir',
+        type=str,
+        default=None,
+        help='Cache successful Steam API responses in this directory.'
+    )
+    parser.add_argument(
+        '--http-cache-ttl',
+        type=float,
+        default=None,
+        help='Maximum age in seconds of a cached response (default: never expires).'
+    )
+    parser.add_argument(
+        '--report-path',
+        type=str,
+        default=None,
+        help='Write a JSON run report with per-stage timings and counters to this file.'
+    )
+    parser.add_argument(
+        '--profile',
+        type=str,
+        default=None,
+        help='Write cProfile stats for the run to this file.'
+    )
     return parser.parse_args()
 
-def main():
+def run_action(db: Database, args):
     """
-    Main entry point for the ETL script. Connects to the database and executes the selected task.
+    Execute the task selected on the command line.
+
+    Args:
+        db (Database): The database connection instance.
+        args (argparse.Namespace): Parsed arguments.
     """
-    db = Database()
-    if not db.connect():
+    from Scheduler.JobQueue import JobQueue
+
+    if (args.enqueue_games or args.run_workers or args.daemon) and not db.dialect.supports_skip_locked:
+        print(f"The review job queue and the refresh daemon need PostgreSQL, not {db.dialect.name}.")
         return
 
-    args = parse_arguments()
+    spool_dir = None if args.no_spool else args.spool_dir
 
-    if args.update_games:
-        cron_job_fetch_games(db)
+    if args.update_games or args.enqueue_games or args.run_workers:
+        if args.update_games:
+            cron_job_fetch_games(db, args.games_refresh, args.load_chunk_size)
+        if args.enqueue_games:
+            JobQueue(db).enqueue(read_game_ids_file(args.game_ids_file) if args.game_ids_file else None)
+        if args.run_workers:
+            run_review_workers(db, args)
+    elif args.daemon:
+        run_refresh_daemon(db, args)
     elif args.game_id:
-        fetch_reviews_for_game(db, args.game_id, args.review_limit)
+        if args.incremental:
+            sync_reviews_for_game(db, args.game_id, args.review_limit, args.chunk_size)
+        else:
+            fetch_reviews_for_game(db, args.game_id, args.review_limit, args.chunk_size, spool_dir, args.resume,
+                                   args.offset_windows)
+    elif args.game_ids_file or args.all_games:
+        gameids = read_game_ids_file(args.game_ids_file) if args.game_ids_file else db.get_game_ids()
+        fetch_reviews_for_games(db, gameids, args.review_limit, args.workers, args.chunk_size, args.incremental,
+                                spool_dir, args.resume, args.offset_windows)
     elif args.fetch_sql_data:
-        cron_job_fetch_all_sql_data(db)
+        cron_job_fetch_all_sql_data(db, args.export_dir, args.export_format, args.since)
+    elif args.refresh_analytics:
+        db.refresh_review_stats()
+    elif args.detach_reviews_before:
+        db.detach_partitions("reviews", args.detach_reviews_before)
     else:
         print("No action specified.")
 
+def has_action(args) -> bool:
+    """
+    Check whether the command line selects a task.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments.
+
+    Returns:
+        bool: True if run_action has work to do.
+    """
+    return any((
+        args.update_games, args.enqueue_games, args.run_workers, args.daemon, args.game_id,
+        args.game_ids_file, args.all_games, args.fetch_sql_data, args.refresh_analytics,
+        args.detach_reviews_before,
+    ))
+
+def main():
+    """
+    Main entry point for the ETL script. Sets up the database engine and executes the selected task.
+    Nothing is imported or connected beyond argument parsing unless a task was selected.
+    """
+    args = parse_arguments()
+    if not has_action(args):
+        print("No action specified.")
+        return
+
+    import ExtractData.HttpClient as HttpClient
+    from LoadData.LoadSteamData import Database
+
+    HttpClient.configure(
+        timeout=(5.0, args.http_timeout),
+        max_attempts=args.max_attempts,
+        pool_size=max(16, args.workers * args.offset_windows),
+        cache_dir=args.http_cache_dir,
+        cache_ttl=args.http_cache_ttl,
+        rate_limiter=TokenBucket(args.requests_per_second)
+    )
+
+    db = Database(args.load_method, args.load_chunk_size, user_cache_size=args.user_cache_size)
+    if not db.connect():
+        return
+
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    metrics.reset()
+    try:
+        run_action(db, args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Wrote cProfile stats to {args.profile}")
+        if args.report_path:
+            metrics.write_report(args.report_path, arguments=vars(args))
+            print(f"Wrote run report to {args.report_path}")
+
 if __name__ == "__main__":
     main()
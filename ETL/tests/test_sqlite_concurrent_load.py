@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import unittest
+from sqlalchemy import text
+import ExtractData.ExtractSteamData as ExtractSteamData
+import ExtractData.HttpClient as HttpClient
+import ExtractData.Pagination as Pagination
+from Benchmarks.FakeSteamApi import FakeSteamApi
+from LoadData.Engine import dispose_engines
+from LoadData.LoadSteamData import Database
+import main
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from DB.DatabaseSchema import create_tables
+
+GAMES = 8
+REVIEWS_PER_GAME = 1500
+
+class ConcurrentSQLiteLoadTest(unittest.TestCase):
+    """
+    Several games loaded at once into one SQLite file, as `main.py --workers N` does with a SQLite DATABASE_URL.
+    """
+
+    def setUp(self):
+        self.scratch_dir = tempfile.TemporaryDirectory(prefix="steam_etl_test_")
+        self.url = f"sqlite:///{os.path.join(self.scratch_dir.name, 'test.db')}"
+
+        self.api = FakeSteamApi(REVIEWS_PER_GAME, GAMES).start()
+        self.saved_urls = (Pagination.BASE_URL, ExtractSteamData.APP_LIST_URL)
+        Pagination.BASE_URL = f"{self.api.base_url}/appreviews/"
+        ExtractSteamData.APP_LIST_URL = f"{self.api.base_url}/ISteamApps/GetAppList/v2/"
+        HttpClient.configure(initial_backoff=0.05, max_backoff=1.0, max_attempts=20)
+
+        create_tables(url=self.url)
+        self.db = Database(url=self.url)
+        self.assertTrue(self.db.connect())
+        main.cron_job_fetch_games(self.db)
+
+    def tearDown(self):
+        Pagination.BASE_URL, ExtractSteamData.APP_LIST_URL = self.saved_urls
+        HttpClient.configure()
+        self.api.stop()
+        dispose_engines()
+        self.scratch_dir.cleanup()
+
+    def test_concurrent_game_loads(self):
+        gameids = self.db.get_game_ids()[:GAMES]
+        failures = main.fetch_reviews_for_games(self.db, gameids, None, workers=4, chunk_size=500)
+
+        self.assertEqual(failures, {})
+        with self.db.engine.connect() as conn:
+            loaded = conn.execute(text("SELECT COUNT(*) FROM reviews")).scalar()
+        self.assertEqual(loaded, GAMES * REVIEWS_PER_GAME)
+
+if __name__ == "__main__":
+    unittest.main()